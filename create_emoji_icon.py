@@ -1,23 +1,23 @@
 #!/usr/bin/env python3
 import os
 from PIL import Image, ImageDraw, ImageFont
+from iconset_utils import render_base, write_iconset
 import math
 
-def create_emoji_icon():
-    # Create a 512x512 image with transparent background
-    size = 512
+# Font paths to try for emoji support, in order
+FONT_PATHS = (
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/Library/Fonts/Arial Unicode MS.ttf",
+)
+
+def draw_emoji_icon(size, font_paths):
+    # Create an image with transparent background
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     
     # Try to use system font for emoji, fallback to default
     try:
-        # Try different font paths for emoji support
-        font_paths = [
-            "/System/Library/Fonts/Apple Color Emoji.ttc",
-            "/System/Library/Fonts/Helvetica.ttc",
-            "/Library/Fonts/Arial Unicode MS.ttf"
-        ]
-        
         font = None
         for font_path in font_paths:
             if os.path.exists(font_path):
@@ -49,36 +49,13 @@ def create_emoji_icon():
     
     return img
 
+def create_emoji_icon():
+    # 512x512 base image, rendered once and cached
+    return render_base("emoji_icon", 512, FONT_PATHS, draw_emoji_icon)
+
 def create_emoji_iconset():
     """Create iconset with multiple sizes for macOS"""
-    sizes = [16, 32, 64, 128, 256, 512, 1024]
-    
-    # Create iconset directory
-    iconset_dir = "KinectMaster.app/Contents/Resources/emoji_icon.iconset"
-    os.makedirs(iconset_dir, exist_ok=True)
-    
-    # Create base image
-    base_img = create_emoji_icon()
-    
-    # Create different sizes
-    for size in sizes:
-        resized = base_img.resize((size, size), Image.Resampling.LANCZOS)
-        
-        # Save as PNG
-        filename = f"icon_{size}x{size}.png"
-        if size >= 1024:
-            filename = f"icon_{size}x{size}@2x.png"
-        
-        resized.save(os.path.join(iconset_dir, filename))
-        print(f"Created {filename}")
-    
-    # Create retina variants
-    retina_sizes = [(16, 32), (32, 64), (128, 256), (256, 512)]
-    for base_size, retina_size in retina_sizes:
-        retina_img = base_img.resize((retina_size, retina_size), Image.Resampling.LANCZOS)
-        retina_img.save(os.path.join(iconset_dir, f"icon_{base_size}x{base_size}@2x.png"))
-        print(f"Created icon_{base_size}x{base_size}@2x.png")
-    
+    write_iconset(create_emoji_icon(), "KinectMaster.app/Contents/Resources/emoji_icon.iconset")
     print("Emoji icon set created successfully!")
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
-import os
 from PIL import Image, ImageDraw, ImageFont
+from iconset_utils import render_base, write_iconset
 
-def create_simple_pumpkin():
-    # Create a 512x512 image with transparent background
-    size = 512
+# Font paths to try for the emoji, in order
+FONT_PATHS = (
+    '/System/Library/Fonts/Apple Color Emoji.ttc',
+    '/System/Library/Fonts/Helvetica.ttc',
+)
+
+def draw_simple_pumpkin(size, font_paths):
+    # Create an image with transparent background
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     
@@ -13,13 +18,15 @@ def create_simple_pumpkin():
     draw.ellipse(circle_bbox, fill=(255, 140, 0, 255), outline=(255, 127, 0, 255), width=4)
     
     # Try to use system font
-    try:
-        font = ImageFont.truetype('/System/Library/Fonts/Apple Color Emoji.ttc', size//3)
-    except:
+    font = None
+    for font_path in font_paths:
         try:
-            font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', size//3)
+            font = ImageFont.truetype(font_path, size//3)
+            break
         except:
-            font = ImageFont.load_default()
+            continue
+    if font is None:
+        font = ImageFont.load_default()
     
     # Draw pumpkin emoji
     emoji_text = "🎃"
@@ -33,36 +40,13 @@ def create_simple_pumpkin():
     
     return img
 
+def create_simple_pumpkin():
+    # 512x512 base image, rendered once and cached
+    return render_base("final_icon", 512, FONT_PATHS, draw_simple_pumpkin)
+
 def create_icon_set():
     """Create iconset with multiple sizes"""
-    sizes = [16, 32, 64, 128, 256, 512, 1024]
-    
-    # Create iconset directory
-    iconset_dir = "KinectMaster.app/Contents/Resources/final_icon.iconset"
-    os.makedirs(iconset_dir, exist_ok=True)
-    
-    # Create base image
-    base_img = create_simple_pumpkin()
-    
-    # Create different sizes
-    for size in sizes:
-        resized = base_img.resize((size, size), Image.Resampling.LANCZOS)
-        
-        # Save as PNG
-        filename = f"icon_{size}x{size}.png"
-        if size >= 1024:
-            filename = f"icon_{size}x{size}@2x.png"
-        
-        resized.save(os.path.join(iconset_dir, filename))
-        print(f"Created {filename}")
-    
-    # Create retina variants
-    retina_sizes = [(16, 32), (32, 64), (128, 256), (256, 512)]
-    for base_size, retina_size in retina_sizes:
-        retina_img = base_img.resize((retina_size, retina_size), Image.Resampling.LANCZOS)
-        retina_img.save(os.path.join(iconset_dir, f"icon_{base_size}x{base_size}@2x.png"))
-        print(f"Created icon_{base_size}x{base_size}@2x.png")
-    
+    write_iconset(create_simple_pumpkin(), "KinectMaster.app/Contents/Resources/final_icon.iconset")
     print("Final pumpkin icon set created!")
 
 if __name__ == "__main__":
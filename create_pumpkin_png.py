@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import os
 from PIL import Image, ImageDraw, ImageFont
+from iconset_utils import render_base, write_iconset
 import subprocess
 
-def create_pumpkin_png():
-    # Create a 512x512 image with white background
-    size = 512
+# Emoji font and its fallback
+FONT_PATHS = (
+    '/System/Library/Fonts/Apple Color Emoji.ttc',
+    '/System/Library/Fonts/Helvetica.ttc',
+)
+
+def draw_pumpkin_png(size, font_paths):
+    # Create an image with white background
     img = Image.new('RGBA', (size, size), (255, 255, 255, 255))
     draw = ImageDraw.Draw(img)
     
@@ -14,9 +20,9 @@ def create_pumpkin_png():
         # Use system command to find emoji font
         result = subprocess.run(['fc-list', ':family'], capture_output=True, text=True)
         if 'Apple Color Emoji' in result.stdout:
-            font_path = '/System/Library/Fonts/Apple Color Emoji.ttc'
+            font_path = font_paths[0]
         else:
-            font_path = '/System/Library/Fonts/Helvetica.ttc'
+            font_path = font_paths[1]
         
         if os.path.exists(font_path):
             font = ImageFont.truetype(font_path, size//2)
@@ -47,36 +53,13 @@ def create_pumpkin_png():
     
     return img
 
+def create_pumpkin_png():
+    # 512x512 base image, rendered once and cached
+    return render_base("pumpkin_png", 512, FONT_PATHS, draw_pumpkin_png)
+
 def create_all_sizes():
     """Create PNG files for all required sizes"""
-    sizes = [16, 32, 64, 128, 256, 512, 1024]
-    
-    # Create iconset directory
-    iconset_dir = "KinectMaster.app/Contents/Resources/pumpkin_icon.iconset"
-    os.makedirs(iconset_dir, exist_ok=True)
-    
-    # Create base image
-    base_img = create_pumpkin_png()
-    
-    # Create different sizes
-    for size in sizes:
-        resized = base_img.resize((size, size), Image.Resampling.LANCZOS)
-        
-        # Save as PNG
-        filename = f"icon_{size}x{size}.png"
-        if size >= 1024:
-            filename = f"icon_{size}x{size}@2x.png"
-        
-        resized.save(os.path.join(iconset_dir, filename))
-        print(f"Created {filename}")
-    
-    # Create retina variants
-    retina_sizes = [(16, 32), (32, 64), (128, 256), (256, 512)]
-    for base_size, retina_size in retina_sizes:
-        retina_img = base_img.resize((retina_size, retina_size), Image.Resampling.LANCZOS)
-        retina_img.save(os.path.join(iconset_dir, f"icon_{base_size}x{base_size}@2x.png"))
-        print(f"Created icon_{base_size}x{base_size}@2x.png")
-    
+    write_iconset(create_pumpkin_png(), "KinectMaster.app/Contents/Resources/pumpkin_icon.iconset")
     print("Pumpkin PNG icon set created successfully!")
 
 if __name__ == "__main__":
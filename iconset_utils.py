@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Shared helpers for the create_*icon*.py scripts"""
+import functools
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Standard sizes written into every iconset
+ICONSET_SIZES = [16, 32, 64, 128, 256, 512, 1024]
+
+# (base size, pixel size) pairs for the @2x retina variants
+RETINA_SIZES = [(16, 32), (32, 64), (128, 256), (256, 512)]
+
+# Rendered base images are kept here between runs
+CACHE_DIR = ".cache"
+
+
+@functools.lru_cache(maxsize=None)
+def render_base(name, size, font_paths, draw_fn):
+    """Return the base image for an icon, rendering it only on a cache miss.
+
+    draw_fn(size, font_paths) does the actual drawing. The result is stored
+    in CACHE_DIR keyed by name, size, the candidate fonts that exist and the
+    mtime of the script defining draw_fn, so the emoji glyph is only
+    rasterized again when one of those changes.
+    """
+    script = draw_fn.__code__.co_filename
+    key = "|".join([
+        name,
+        str(size),
+        *(p for p in font_paths if os.path.exists(p)),
+        str(os.path.getmtime(script)) if os.path.exists(script) else "",
+    ])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    cache_path = os.path.join(CACHE_DIR, f"base_{name}_{digest}.png")
+
+    if os.path.exists(cache_path):
+        with Image.open(cache_path) as img:
+            return img.copy()
+
+    img = draw_fn(size, font_paths)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    img.save(cache_path)
+    return img
+
+
+class IconResampler:
+    """Lanczos resizer that resamples each target size only once.
+
+    The retina variants reuse pixel sizes that are already in
+    ICONSET_SIZES, so caching per size removes the duplicate resamples.
+    Sizes that evenly divide the base are built as a mipmap chain, each
+    level halving the one above it, so small icons don't run Lanczos over
+    the full-resolution source.
+    """
+
+    def __init__(self, base_img):
+        self.base_img = base_img
+        self._cache = {}
+
+    def resize(self, size):
+        img = self._cache.get(size)
+        if img is None:
+            base_size = self.base_img.size[0]
+            parent_size = size * 2
+            if parent_size < base_size and base_size % parent_size == 0:
+                src = self.resize(parent_size)
+            else:
+                src = self.base_img
+            img = src.resize((size, size), Image.Resampling.LANCZOS)
+            self._cache[size] = img
+        return img
+
+
+def write_iconset(base_img, iconset_dir):
+    """Write all standard and retina icon sizes for base_img into iconset_dir"""
+    os.makedirs(iconset_dir, exist_ok=True)
+    resampler = IconResampler(base_img)
+
+    # Standard sizes followed by the retina variants
+    jobs = []
+    for size in ICONSET_SIZES:
+        filename = f"icon_{size}x{size}.png"
+        if size >= 1024:
+            filename = f"icon_{size}x{size}@2x.png"
+        jobs.append((filename, size))
+    for base_size, retina_size in RETINA_SIZES:
+        jobs.append((f"icon_{base_size}x{base_size}@2x.png", retina_size))
+
+    # Resample up front (the mipmap chain is sequential), then encode the
+    # PNGs in parallel - zlib releases the GIL while compressing
+    images = [(filename, resampler.resize(size)) for filename, size in jobs]
+
+    def emit(job):
+        filename, img = job
+        img.save(os.path.join(iconset_dir, filename), optimize=False, compress_level=6)
+        return filename
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        for filename in ex.map(emit, images):
+            print(f"Created {filename}")
+
+    compile_icns(iconset_dir)
+
+
+def compile_icns(iconset_dir):
+    """Pack an .iconset directory into an .icns file with macOS iconutil.
+
+    Returns the .icns path, or None when iconutil isn't available (not on
+    macOS) or the directory isn't named *.iconset.
+    """
+    if not iconset_dir.endswith(".iconset") or shutil.which("iconutil") is None:
+        return None
+
+    icns_path = iconset_dir[:-len(".iconset")] + ".icns"
+    result = subprocess.run(["iconutil", "-c", "icns", iconset_dir, "-o", icns_path],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"iconutil failed: {result.stderr.strip()}")
+        return None
+
+    print(f"Created {os.path.basename(icns_path)}")
+    return icns_path
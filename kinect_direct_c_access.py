@@ -12,6 +12,9 @@ import ctypes.util
 import time
 import numpy as np
 import cv2
+from kinect_direct_implementation import (FREENECT_DEVICE_CAMERA, FREENECT_LOG_DEBUG,
+                                          FREENECT_RESOLUTION_MEDIUM, FREENECT_DEPTH_MM,
+                                          FREENECT_VIDEO_RGB)
 
 # Load the libfreenect library
 libfreenect_path = "./libfreenect/build/lib/libfreenect.0.dylib"
@@ -24,6 +27,20 @@ class FreenectContext(ctypes.Structure):
 class FreenectDevice(ctypes.Structure):
     pass
 
+class FreenectFrameMode(ctypes.Structure):
+    _fields_ = [
+        ("reserved", ctypes.c_uint),
+        ("resolution", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("bytes", ctypes.c_int),
+        ("width", ctypes.c_short),
+        ("height", ctypes.c_short),
+        ("data_bits_per_pixel", ctypes.c_uint8),
+        ("padding_bits_per_pixel", ctypes.c_uint8),
+        ("framerate", ctypes.c_uint8),
+        ("is_valid", ctypes.c_uint8),
+    ]
+
 # Function signatures
 libfreenect.freenect_init.argtypes = [ctypes.POINTER(ctypes.POINTER(FreenectContext)), ctypes.POINTER(ctypes.c_void_p)]
 libfreenect.freenect_init.restype = ctypes.c_int
@@ -46,21 +63,38 @@ libfreenect.freenect_select_subdevices.restype = None
 libfreenect.freenect_set_log_level.argtypes = [ctypes.POINTER(FreenectContext), ctypes.c_int]
 libfreenect.freenect_set_log_level.restype = None
 
-# Constants
-FREENECT_DEVICE_CAMERA = 0x02
-FREENECT_LOG_DEBUG = 3
+# Modes and streams, used by prepare_device
+libfreenect.freenect_find_depth_mode.argtypes = [ctypes.c_int, ctypes.c_int]
+libfreenect.freenect_find_depth_mode.restype = FreenectFrameMode
 
-def test_direct_c_access():
-    """Test direct access to libfreenect C library"""
-    print("🔧 Testing Direct C Library Access")
-    print("==================================")
+libfreenect.freenect_find_video_mode.argtypes = [ctypes.c_int, ctypes.c_int]
+libfreenect.freenect_find_video_mode.restype = FreenectFrameMode
+
+libfreenect.freenect_set_depth_mode.argtypes = [ctypes.POINTER(FreenectDevice), FreenectFrameMode]
+libfreenect.freenect_set_depth_mode.restype = ctypes.c_int
+
+libfreenect.freenect_set_video_mode.argtypes = [ctypes.POINTER(FreenectDevice), FreenectFrameMode]
+libfreenect.freenect_set_video_mode.restype = ctypes.c_int
+
+for _name in ("freenect_start_depth", "freenect_start_video",
+              "freenect_stop_depth", "freenect_stop_video"):
+    getattr(libfreenect, _name).argtypes = [ctypes.POINTER(FreenectDevice)]
+    getattr(libfreenect, _name).restype = ctypes.c_int
+
+libfreenect.freenect_process_events.argtypes = [ctypes.POINTER(FreenectContext)]
+libfreenect.freenect_process_events.restype = ctypes.c_int
+
+def open_camera():
+    """Init libfreenect, select the camera and open the first device.
     
+    Returns (ctx, dev), or None after shutting the context down on failure.
+    """
     # Initialize context
     ctx_ptr = ctypes.POINTER(FreenectContext)()
     ret = libfreenect.freenect_init(ctypes.byref(ctx_ptr), None)
     if ret < 0:
         print(f"❌ Failed to initialize freenect context: {ret}")
-        return False
+        return None
     print("✅ Freenect context initialized")
 
     # Set log level and select camera
@@ -73,11 +107,11 @@ def test_direct_c_access():
     if num_devices < 0:
         print(f"❌ Failed to get device count: {num_devices}")
         libfreenect.freenect_shutdown(ctx_ptr)
-        return False
+        return None
     if num_devices == 0:
         print("❌ No Kinect devices found!")
         libfreenect.freenect_shutdown(ctx_ptr)
-        return False
+        return None
     print(f"✅ Found {num_devices} Kinect device(s)")
 
     # Try to open device
@@ -86,9 +120,104 @@ def test_direct_c_access():
     if ret < 0:
         print(f"❌ Failed to open device: {ret}")
         libfreenect.freenect_shutdown(ctx_ptr)
-        return False
+        return None
     print("✅ Device opened successfully!")
 
+    return ctx_ptr, dev_ptr
+
+def prepare_device(stabilize_seconds=3):
+    """Prepare the Kinect for Python freenect, like ./kinect_device_manager.
+    
+    Same sequence as kinect_device_manager.c: open the camera, set the
+    medium-resolution mm depth and RGB modes, start both streams, pump
+    freenect_process_events at ~30 Hz for stabilize_seconds, then stop the
+    streams, close the device and shut the context down. Returns True if
+    the streams could be started.
+    """
+    opened = open_camera()
+    if opened is None:
+        return False
+    ctx_ptr, dev_ptr = opened
+
+    # Set depth and video modes
+    depth_mode = libfreenect.freenect_find_depth_mode(FREENECT_RESOLUTION_MEDIUM, FREENECT_DEPTH_MM)
+    ret = libfreenect.freenect_set_depth_mode(dev_ptr, depth_mode)
+    if ret < 0:
+        print(f"❌ Failed to set depth mode: {ret}")
+        libfreenect.freenect_close_device(dev_ptr)
+        libfreenect.freenect_shutdown(ctx_ptr)
+        return False
+    print("✅ Depth mode set")
+
+    video_mode = libfreenect.freenect_find_video_mode(FREENECT_RESOLUTION_MEDIUM, FREENECT_VIDEO_RGB)
+    ret = libfreenect.freenect_set_video_mode(dev_ptr, video_mode)
+    if ret < 0:
+        print(f"❌ Failed to set video mode: {ret}")
+        libfreenect.freenect_close_device(dev_ptr)
+        libfreenect.freenect_shutdown(ctx_ptr)
+        return False
+    print("✅ Video mode set")
+
+    # Start depth and video streams
+    ret = libfreenect.freenect_start_depth(dev_ptr)
+    if ret < 0:
+        print(f"❌ Failed to start depth stream: {ret}")
+        libfreenect.freenect_close_device(dev_ptr)
+        libfreenect.freenect_shutdown(ctx_ptr)
+        return False
+    print("✅ Depth stream started")
+
+    ret = libfreenect.freenect_start_video(dev_ptr)
+    if ret < 0:
+        print(f"❌ Failed to start video stream: {ret}")
+        libfreenect.freenect_stop_depth(dev_ptr)
+        libfreenect.freenect_close_device(dev_ptr)
+        libfreenect.freenect_shutdown(ctx_ptr)
+        return False
+    print("✅ Video stream started")
+
+    # Let the device run for a few seconds to stabilize
+    print(f"🔄 Stabilizing device for {stabilize_seconds} seconds...")
+    remaining = stabilize_seconds
+    frame_count = 0
+    try:
+        while remaining > 0:
+            ret = libfreenect.freenect_process_events(ctx_ptr)
+            if ret < 0:
+                print(f"❌ Error processing events: {ret}")
+                break
+            
+            frame_count += 1
+            if frame_count % 30 == 0:  # Every ~1 second at 30fps
+                remaining -= 1
+                print(f"   Stabilizing... {remaining} seconds remaining")
+            
+            time.sleep(1 / 30)
+    except KeyboardInterrupt:
+        # Ctrl+C ends stabilization early but still releases the device
+        pass
+    print(f"✅ Device stabilized ({frame_count} frames processed)")
+
+    # Now cleanly shut down
+    print("🔄 Shutting down cleanly...")
+    libfreenect.freenect_stop_depth(dev_ptr)
+    libfreenect.freenect_stop_video(dev_ptr)
+    libfreenect.freenect_close_device(dev_ptr)
+    libfreenect.freenect_shutdown(ctx_ptr)
+    print("✅ Device released cleanly")
+
+    return True
+
+def test_direct_c_access():
+    """Test direct access to libfreenect C library"""
+    print("🔧 Testing Direct C Library Access")
+    print("==================================")
+    
+    opened = open_camera()
+    if opened is None:
+        return False
+    ctx_ptr, dev_ptr = opened
+
     # Keep device open for a few seconds
     print("🔄 Keeping device open for 5 seconds...")
     time.sleep(5)
@@ -15,6 +15,97 @@ import cv2
 import threading
 from typing import Optional, Tuple
 
+# libfreenect constants, kept as plain module-level ints so calls pass
+# them without an attribute lookup (values from libfreenect.h)
+FREENECT_DEVICE_CAMERA = 0x02
+FREENECT_LOG_DEBUG = 5
+FREENECT_RESOLUTION_MEDIUM = 1
+FREENECT_DEPTH_MM = 5
+FREENECT_VIDEO_RGB = 0
+
+# Frame shapes for the 640x480 depth (uint16) and RGB (uint8) modes
+DEPTH_SHAPE = (480, 640)
+VIDEO_SHAPE = (480, 640, 3)
+
+# Depth (mm) to 8-bit preview scale: ~5 m maps onto the full 0-255 range
+DEPTH_DISPLAY_ALPHA = 0.05
+
+def depth_to_u8(src, dst, alpha=DEPTH_DISPLAY_ALPHA):
+    """Scale a uint16 depth frame into a preallocated uint8 buffer.
+
+    convertScaleAbs does the multiply, abs and saturating cast in a single
+    vectorized pass, so this is just the one shared call site for it.
+    """
+    return cv2.convertScaleAbs(src, dst=dst, alpha=alpha)
+
+# Depth band (mm) the preview loops keep in the video window: roughly the
+# space in front of the display where people stand
+PREVIEW_DEPTH_BAND = (500, 3000)
+
+class FramePreview:
+    """Shows depth + RGB frames with imshow using preallocated buffers.
+    
+    With depth_band=(near_mm, far_mm) the video window only shows pixels
+    whose depth falls inside the band.
+    """
+    
+    def __init__(self, depth_window='Depth', video_window='Video', depth_band=None):
+        self.depth_window = depth_window
+        self.video_window = video_window
+        self.depth_band = depth_band
+        self._depth_u8 = np.empty((480, 640), dtype=np.uint8)
+        self._rgb_bgr = np.empty((480, 640, 3), dtype=np.uint8)
+        self._band_mask = np.empty((480, 640), dtype=np.uint8)
+        self._masked = np.empty((480, 640, 3), dtype=np.uint8)
+    
+    def process_frame(self, depth, rgb, near_mm, far_mm):
+        """Return rgb as BGR with everything outside [near_mm, far_mm] blacked out"""
+        cv2.inRange(depth, near_mm, far_mm, dst=self._band_mask)
+        cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._rgb_bgr)
+        self._masked.fill(0)
+        return cv2.copyTo(self._rgb_bgr, self._band_mask, self._masked)
+    
+    def show(self, depth, rgb):
+        """Display one frame pair; libfreenect gives RGB but imshow wants BGR"""
+        depth_to_u8(depth, self._depth_u8)
+        if self.depth_band is not None:
+            video = self.process_frame(depth, rgb, *self.depth_band)
+        else:
+            video = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=self._rgb_bgr)
+        cv2.imshow(self.depth_window, self._depth_u8)
+        cv2.imshow(self.video_window, video)
+
+class FrameSlots:
+    """Three preallocated frames shared by a libfreenect callback and readers.
+    
+    libfreenect refills its own buffers on the event thread, so the callback
+    copies each frame into a slot that is neither the latest frame nor the
+    one last handed to a reader. A frame a reader holds therefore stays
+    intact until that reader asks for the next one. The owner's lock must
+    be held around write_slot, publish and read.
+    """
+    
+    def __init__(self, shape, dtype):
+        self.frames = [np.empty(shape, dtype=dtype) for _ in range(3)]
+        self.latest = None   # Index of the newest complete frame
+        self.reading = None  # Index of the frame last handed out
+    
+    def write_slot(self):
+        """Index of a slot the callback may fill"""
+        for i in range(3):
+            if i != self.latest and i != self.reading:
+                return i
+    
+    def publish(self, i):
+        self.latest = i
+    
+    def read(self):
+        """Hand out the newest frame, or None before the first one"""
+        if self.latest is None:
+            return None
+        self.reading = self.latest
+        return self.frames[self.reading]
+
 class KinectDirectAccess:
     """Direct access to Kinect using libfreenect C library via ctypes"""
     
@@ -49,15 +140,24 @@ class KinectDirectAccess:
         self.FreenectDevice = FreenectDevice
         self.FreenectFrameMode = FreenectFrameMode
         
+        # Handle types, built once and shared by every signature below
+        self._CtxP = ctypes.POINTER(FreenectContext)
+        self._DevP = ctypes.POINTER(FreenectDevice)
+        
+        # void (*)(freenect_device *dev, void *data, uint32_t timestamp)
+        self.DepthCallback = ctypes.CFUNCTYPE(None, self._DevP, ctypes.c_void_p, ctypes.c_uint32)
+        self.VideoCallback = ctypes.CFUNCTYPE(None, self._DevP, ctypes.c_void_p, ctypes.c_uint32)
+        
         # Function signatures
         self._setup_function_signatures()
         
-        # Constants
-        self.FREENECT_DEVICE_CAMERA = 0x02
-        self.FREENECT_LOG_DEBUG = 3
-        self.FREENECT_RESOLUTION_MEDIUM = 1
-        self.FREENECT_DEPTH_MM = 2
-        self.FREENECT_VIDEO_RGB = 0
+        # Bound once so the event loop skips the CDLL attribute lookup
+        self._process_events = self.libfreenect.freenect_process_events
+        
+        # Frame modes come from static tables in libfreenect, so look them up
+        # once and reuse them for every (re)open
+        self._depth_mode = self.libfreenect.freenect_find_depth_mode(FREENECT_RESOLUTION_MEDIUM, FREENECT_DEPTH_MM)
+        self._video_mode = self.libfreenect.freenect_find_video_mode(FREENECT_RESOLUTION_MEDIUM, FREENECT_VIDEO_RGB)
         
         # Device state
         self.ctx = None
@@ -65,75 +165,95 @@ class KinectDirectAccess:
         self.running = False
         self.event_thread = None
         
-        # Frame data
-        self.latest_depth = None
-        self.latest_video = None
+        # Frame data, copied in by the libfreenect callbacks on the event thread
+        self.depth_slots = FrameSlots(DEPTH_SHAPE, np.uint16)
+        self.video_slots = FrameSlots(VIDEO_SHAPE, np.uint8)
         self.depth_lock = threading.Lock()
         self.video_lock = threading.Lock()
+        
+        # Bumped by the depth callback for every new frame, so a reader can
+        # tell fresh data from the frame it already has
+        self.depth_seq = 0
+        self._depth_cond = threading.Condition(self.depth_lock)
+        
+        # Keep references to the ctypes callbacks so they aren't collected
+        # while libfreenect still holds the function pointers
+        self._depth_cb = self.DepthCallback(self._on_depth)
+        self._video_cb = self.VideoCallback(self._on_video)
     
     def _setup_function_signatures(self):
         """Setup function signatures for libfreenect calls"""
         lib = self.libfreenect
         
         # Context management
-        lib.freenect_init.argtypes = [ctypes.POINTER(ctypes.POINTER(self.FreenectContext)), ctypes.POINTER(ctypes.c_void_p)]
+        lib.freenect_init.argtypes = [ctypes.POINTER(self._CtxP), ctypes.POINTER(ctypes.c_void_p)]
         lib.freenect_init.restype = ctypes.c_int
         
-        lib.freenect_shutdown.argtypes = [ctypes.POINTER(self.FreenectContext)]
+        lib.freenect_shutdown.argtypes = [self._CtxP]
         lib.freenect_shutdown.restype = ctypes.c_int
         
         # Device management
-        lib.freenect_num_devices.argtypes = [ctypes.POINTER(self.FreenectContext)]
+        lib.freenect_num_devices.argtypes = [self._CtxP]
         lib.freenect_num_devices.restype = ctypes.c_int
         
-        lib.freenect_open_device.argtypes = [ctypes.POINTER(self.FreenectContext), ctypes.POINTER(ctypes.POINTER(self.FreenectDevice)), ctypes.c_int]
+        lib.freenect_open_device.argtypes = [self._CtxP, ctypes.POINTER(self._DevP), ctypes.c_int]
         lib.freenect_open_device.restype = ctypes.c_int
         
-        lib.freenect_close_device.argtypes = [ctypes.POINTER(self.FreenectDevice)]
+        lib.freenect_close_device.argtypes = [self._DevP]
         lib.freenect_close_device.restype = ctypes.c_int
         
         # Configuration
-        lib.freenect_select_subdevices.argtypes = [ctypes.POINTER(self.FreenectContext), ctypes.c_int]
+        lib.freenect_select_subdevices.argtypes = [self._CtxP, ctypes.c_int]
         lib.freenect_select_subdevices.restype = None
         
-        lib.freenect_set_log_level.argtypes = [ctypes.POINTER(self.FreenectContext), ctypes.c_int]
+        lib.freenect_set_log_level.argtypes = [self._CtxP, ctypes.c_int]
         lib.freenect_set_log_level.restype = None
         
-        # Mode management
+        # Mode management. freenect_frame_mode is passed and returned by value;
+        # the resolution/format enums are int-sized, so c_int matches the ABI.
         lib.freenect_find_depth_mode.argtypes = [ctypes.c_int, ctypes.c_int]
-        lib.freenect_find_depth_mode.restype = ctypes.POINTER(self.FreenectFrameMode)
+        lib.freenect_find_depth_mode.restype = self.FreenectFrameMode
         
         lib.freenect_find_video_mode.argtypes = [ctypes.c_int, ctypes.c_int]
-        lib.freenect_find_video_mode.restype = ctypes.POINTER(self.FreenectFrameMode)
+        lib.freenect_find_video_mode.restype = self.FreenectFrameMode
         
-        lib.freenect_set_depth_mode.argtypes = [ctypes.POINTER(self.FreenectDevice), ctypes.POINTER(self.FreenectFrameMode)]
+        lib.freenect_set_depth_mode.argtypes = [self._DevP, self.FreenectFrameMode]
         lib.freenect_set_depth_mode.restype = ctypes.c_int
         
-        lib.freenect_set_video_mode.argtypes = [ctypes.POINTER(self.FreenectDevice), ctypes.POINTER(self.FreenectFrameMode)]
+        lib.freenect_set_video_mode.argtypes = [self._DevP, self.FreenectFrameMode]
         lib.freenect_set_video_mode.restype = ctypes.c_int
         
         # Stream management
-        lib.freenect_start_depth.argtypes = [ctypes.POINTER(self.FreenectDevice)]
+        lib.freenect_start_depth.argtypes = [self._DevP]
         lib.freenect_start_depth.restype = ctypes.c_int
         
-        lib.freenect_start_video.argtypes = [ctypes.POINTER(self.FreenectDevice)]
+        lib.freenect_start_video.argtypes = [self._DevP]
         lib.freenect_start_video.restype = ctypes.c_int
         
-        lib.freenect_stop_depth.argtypes = [ctypes.POINTER(self.FreenectDevice)]
+        lib.freenect_stop_depth.argtypes = [self._DevP]
         lib.freenect_stop_depth.restype = ctypes.c_int
         
-        lib.freenect_stop_video.argtypes = [ctypes.POINTER(self.FreenectDevice)]
+        lib.freenect_stop_video.argtypes = [self._DevP]
         lib.freenect_stop_video.restype = ctypes.c_int
         
         # Event processing
-        lib.freenect_process_events.argtypes = [ctypes.POINTER(self.FreenectContext)]
+        lib.freenect_process_events.argtypes = [self._CtxP]
         lib.freenect_process_events.restype = ctypes.c_int
         
-        # Frame access
-        lib.freenect_sync_get_depth.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint32), ctypes.c_int, ctypes.c_int]
+        # Frame callbacks
+        lib.freenect_set_depth_callback.argtypes = [self._DevP, self.DepthCallback]
+        lib.freenect_set_depth_callback.restype = None
+        
+        lib.freenect_set_video_callback.argtypes = [self._DevP, self.VideoCallback]
+        lib.freenect_set_video_callback.restype = None
+        
+        # Frame access (sync API). The out-param is typed by sample size so a
+        # result can go straight to np.ctypeslib.as_array; declaring it as
+        # c_void_p again would need a ctypes.cast on every call.
+        lib.freenect_sync_get_depth.argtypes = [ctypes.POINTER(ctypes.POINTER(ctypes.c_uint16)), ctypes.POINTER(ctypes.c_uint32), ctypes.c_int, ctypes.c_int]
         lib.freenect_sync_get_depth.restype = ctypes.c_int
         
-        lib.freenect_sync_get_video.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_uint32), ctypes.c_int, ctypes.c_int]
+        lib.freenect_sync_get_video.argtypes = [ctypes.POINTER(ctypes.POINTER(ctypes.c_uint8)), ctypes.POINTER(ctypes.c_uint32), ctypes.c_int, ctypes.c_int]
         lib.freenect_sync_get_video.restype = ctypes.c_int
     
     def initialize(self) -> bool:
@@ -141,7 +261,7 @@ class KinectDirectAccess:
         print("🔧 Initializing Kinect with direct C access...")
         
         # Initialize context
-        ctx_ptr = ctypes.POINTER(self.FreenectContext)()
+        ctx_ptr = self._CtxP()
         ret = self.libfreenect.freenect_init(ctypes.byref(ctx_ptr), None)
         if ret < 0:
             print(f"❌ Failed to initialize freenect context: {ret}")
@@ -150,8 +270,8 @@ class KinectDirectAccess:
         print("✅ Freenect context initialized")
         
         # Set log level and select camera
-        self.libfreenect.freenect_set_log_level(self.ctx, self.FREENECT_LOG_DEBUG)
-        self.libfreenect.freenect_select_subdevices(self.ctx, self.FREENECT_DEVICE_CAMERA)
+        self.libfreenect.freenect_set_log_level(self.ctx, FREENECT_LOG_DEBUG)
+        self.libfreenect.freenect_select_subdevices(self.ctx, FREENECT_DEVICE_CAMERA)
         print("✅ Log level set and camera selected")
         
         # Check device count
@@ -167,7 +287,7 @@ class KinectDirectAccess:
         print(f"✅ Found {num_devices} Kinect device(s)")
         
         # Open device
-        dev_ptr = ctypes.POINTER(self.FreenectDevice)()
+        dev_ptr = self._DevP()
         ret = self.libfreenect.freenect_open_device(self.ctx, ctypes.byref(dev_ptr), 0)
         if ret < 0:
             print(f"❌ Failed to open device: {ret}")
@@ -177,23 +297,24 @@ class KinectDirectAccess:
         print("✅ Device opened successfully")
         
         # Set modes
-        depth_mode = self.libfreenect.freenect_find_depth_mode(self.FREENECT_RESOLUTION_MEDIUM, self.FREENECT_DEPTH_MM)
-        video_mode = self.libfreenect.freenect_find_video_mode(self.FREENECT_RESOLUTION_MEDIUM, self.FREENECT_VIDEO_RGB)
-        
-        ret = self.libfreenect.freenect_set_depth_mode(self.dev, depth_mode)
+        ret = self.libfreenect.freenect_set_depth_mode(self.dev, self._depth_mode)
         if ret < 0:
             print(f"❌ Failed to set depth mode: {ret}")
             self.cleanup()
             return False
         print("✅ Depth mode set")
         
-        ret = self.libfreenect.freenect_set_video_mode(self.dev, video_mode)
+        ret = self.libfreenect.freenect_set_video_mode(self.dev, self._video_mode)
         if ret < 0:
             print(f"❌ Failed to set video mode: {ret}")
             self.cleanup()
             return False
         print("✅ Video mode set")
         
+        # Frames are delivered through callbacks from freenect_process_events
+        self.libfreenect.freenect_set_depth_callback(self.dev, self._depth_cb)
+        self.libfreenect.freenect_set_video_callback(self.dev, self._video_cb)
+        
         # Start streams
         ret = self.libfreenect.freenect_start_depth(self.dev)
         if ret < 0:
@@ -209,48 +330,83 @@ class KinectDirectAccess:
             return False
         print("✅ Video stream started")
         
+        # Pump libfreenect's USB events on a background thread
+        self.running = True
+        self.event_thread = threading.Thread(target=self._event_loop, daemon=True)
+        self.event_thread.start()
+        print("✅ Event thread started")
+        
         return True
     
+    def _event_loop(self):
+        """Run freenect_process_events until cleanup() stops the loop"""
+        process_events = self._process_events
+        ctx = self.ctx
+        while self.running:
+            if process_events(ctx) < 0:
+                print("❌ freenect_process_events failed")
+                break
+    
+    def _on_depth(self, dev, data, timestamp):
+        """Depth callback - copy the frame out before libfreenect reuses its buffer"""
+        slots = self.depth_slots
+        with self.depth_lock:
+            i = slots.write_slot()
+        frame = slots.frames[i]
+        ctypes.memmove(frame.ctypes.data, data, frame.nbytes)
+        with self._depth_cond:
+            slots.publish(i)
+            self.depth_seq += 1
+            self._depth_cond.notify_all()
+    
+    def _on_video(self, dev, data, timestamp):
+        """Video callback - copy the frame out before libfreenect reuses its buffer"""
+        slots = self.video_slots
+        with self.video_lock:
+            i = slots.write_slot()
+        frame = slots.frames[i]
+        ctypes.memmove(frame.ctypes.data, data, frame.nbytes)
+        with self.video_lock:
+            slots.publish(i)
+    
+    def wait_for_frame(self, last_seq=0, timeout=1.0) -> Optional[int]:
+        """Block until depth_seq moves past last_seq.
+        
+        Returns the new sequence number, or None on timeout.
+        """
+        with self._depth_cond:
+            if not self._depth_cond.wait_for(lambda: self.depth_seq != last_seq, timeout):
+                return None
+            return self.depth_seq
+    
     def get_depth_frame(self) -> Optional[np.ndarray]:
-        """Get the latest depth frame"""
-        if not self.dev:
-            return None
-        
-        # Use sync API to get depth frame
-        depth_ptr = ctypes.c_void_p()
-        timestamp = ctypes.c_uint32()
-        
-        ret = self.libfreenect.freenect_sync_get_depth(ctypes.byref(depth_ptr), ctypes.byref(timestamp), 0, 0)
-        if ret < 0:
-            return None
-        
-        # Convert to numpy array (assuming 16-bit depth data)
-        depth_data = ctypes.cast(depth_ptr, ctypes.POINTER(ctypes.c_uint16))
-        depth_array = np.ctypeslib.as_array(depth_data, shape=(480, 640))
-        
-        return depth_array
+        """Get the latest depth frame (valid until the next depth read)"""
+        with self.depth_lock:
+            return self.depth_slots.read()
     
     def get_video_frame(self) -> Optional[np.ndarray]:
-        """Get the latest video frame"""
-        if not self.dev:
-            return None
-        
-        # Use sync API to get video frame
-        video_ptr = ctypes.c_void_p()
-        timestamp = ctypes.c_uint32()
-        
-        ret = self.libfreenect.freenect_sync_get_video(ctypes.byref(video_ptr), ctypes.byref(timestamp), 0, 0)
-        if ret < 0:
-            return None
-        
-        # Convert to numpy array (assuming RGB data)
-        video_data = ctypes.cast(video_ptr, ctypes.POINTER(ctypes.c_uint8))
-        video_array = np.ctypeslib.as_array(video_data, shape=(480, 640, 3))
-        
-        return video_array
+        """Get the latest video frame (valid until the next video read)"""
+        with self.video_lock:
+            return self.video_slots.read()
+    
+    def get_frames(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Get the latest (depth, video) pair with a single lock scope.
+        
+        Both frames stay valid until the next read of that stream.
+        """
+        with self.depth_lock, self.video_lock:
+            if self.depth_slots.latest is None or self.video_slots.latest is None:
+                return None, None
+            return self.depth_slots.read(), self.video_slots.read()
     
     def cleanup(self):
         """Clean up resources"""
+        # Stop the event thread before tearing down the device it services
+        self.running = False
+        if self.event_thread is not None:
+            self.event_thread.join(timeout=1.0)
+            self.event_thread = None
+        
         if self.dev:
             self.libfreenect.freenect_stop_depth(self.dev)
             self.libfreenect.freenect_stop_video(self.dev)
@@ -275,27 +431,35 @@ def test_direct_kinect():
         return False
     
     print("\n🔄 Testing frame capture for 10 seconds...")
-    start_time = time.time()
+    start_time = time.monotonic()
     frame_count = 0
     
-    while time.time() - start_time < 10:
-        depth = kinect.get_depth_frame()
-        video = kinect.get_video_frame()
+    preview = FramePreview(depth_band=PREVIEW_DEPTH_BAND)
+    seq = 0
+    
+    while time.monotonic() - start_time < 10:
+        # Paced by the Kinect itself: wake up when the next depth frame lands
+        new_seq = kinect.wait_for_frame(seq)
+        if new_seq is None:
+            print("❌ Timed out waiting for frames")
+            continue
+        seq = new_seq
+        
+        depth, video = kinect.get_frames()
         
         if depth is not None and video is not None:
             frame_count += 1
-            print(f"✅ Frame {frame_count}: Depth {depth.shape}, Video {video.shape}")
+            # Report about once a second rather than on every frame
+            if frame_count % 30 == 1:
+                print(f"✅ Frame {frame_count}: Depth {depth.shape}, Video {video.shape}")
             
             # Display frames
-            cv2.imshow('Depth', depth.astype(np.uint8))
-            cv2.imshow('Video', video)
+            preview.show(depth, video)
             
             if cv2.waitKey(1) & 0xFF == ord('q'):
                 break
         else:
             print("❌ Failed to get frames")
-        
-        time.sleep(0.033)  # ~30fps
     
     cv2.destroyAllWindows()
     kinect.cleanup()
@@ -4,6 +4,29 @@ import freenect
 import cv2
 import numpy as np
 import time
+import atexit
+
+# One freenect context for the whole process; each context owns libusb
+# state, so it is created on first use and only released at exit
+_FREENECT_CTX = None
+
+def _get_freenect_ctx():
+    """Return the shared freenect context, creating it on first use"""
+    global _FREENECT_CTX
+    if _FREENECT_CTX is None:
+        _FREENECT_CTX = freenect.init()
+        atexit.register(_shutdown_freenect_ctx)
+    return _FREENECT_CTX
+
+def _shutdown_freenect_ctx():
+    """Release the shared freenect context"""
+    global _FREENECT_CTX
+    if _FREENECT_CTX is not None:
+        try:
+            freenect.shutdown(_FREENECT_CTX)
+        except Exception as e:
+            print(f"⚠️ Context shutdown error: {e}")
+        _FREENECT_CTX = None
 
 def proper_kinect_init():
     """Initialize Kinect using the same sequence as freenect-camtest"""
@@ -12,7 +35,7 @@ def proper_kinect_init():
     try:
         # Step 1: Initialize context (like C code)
         print("1. Initializing freenect context...")
-        freenect.init()
+        ctx = _get_freenect_ctx()
         
         # Step 2: Set log level and select camera only (like C code)
         print("2. Setting log level and selecting camera...")
@@ -21,7 +44,7 @@ def proper_kinect_init():
         
         # Step 3: Check device count (like C code)
         print("3. Checking device count...")
-        device_count = freenect.num_devices(freenect.init())
+        device_count = freenect.num_devices(ctx)
         print(f"   Found {device_count} devices")
         
         if device_count == 0:
@@ -30,7 +53,7 @@ def proper_kinect_init():
         
         # Step 4: Open device (like C code)
         print("4. Opening device...")
-        device = freenect.open_device(freenect.init(), 0)
+        device = freenect.open_device(ctx, 0)
         if device is None:
             print("❌ Could not open device!")
             return None
@@ -96,10 +119,16 @@ def cleanup(device):
             freenect.stop_video(device)
             freenect.stop_depth(device)
             freenect.close_device(device)
-            freenect.sync_stop()
             print("✅ Cleanup complete!")
         except Exception as e:
             print(f"⚠️ Cleanup error: {e}")
+    
+    # sync_get_* start libfreenect's own sync thread whether or not our
+    # device opened, so always stop it
+    try:
+        freenect.sync_stop()
+    except Exception as e:
+        print(f"⚠️ sync_stop error: {e}")
 
 def main():
     print("🎃 Testing Proper Kinect Initialization")
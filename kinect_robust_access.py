@@ -3,36 +3,32 @@
 Kinect Robust Access Script
 ===========================
 
-This script uses our C device manager to prepare the Kinect device,
+This script uses libfreenect directly to prepare the Kinect device,
 then attempts to use the Python freenect library.
 """
 
-import subprocess
 import time
 import freenect
 import cv2
 import numpy as np
+from kinect_direct_implementation import FramePreview, PREVIEW_DEPTH_BAND
 
 def run_device_manager():
-    """Run the C device manager to prepare the Kinect"""
+    """Prepare the Kinect in-process through the libfreenect C library"""
     print("🔧 Running device manager to prepare Kinect...")
     
     try:
-        result = subprocess.run(['./kinect_device_manager'], 
-                              capture_output=True, text=True, timeout=10)
+        # Imported here since loading the module loads libfreenect via ctypes
+        from kinect_direct_c_access import prepare_device
         
-        if result.returncode == 0:
+        if prepare_device():
             print("✅ Device manager completed successfully")
             print("   Device should now be ready for Python access")
             return True
         else:
-            print(f"❌ Device manager failed with return code {result.returncode}")
-            print(f"   Error: {result.stderr}")
+            print("❌ Device manager failed")
             return False
             
-    except subprocess.TimeoutExpired:
-        print("❌ Device manager timed out")
-        return False
     except Exception as e:
         print(f"❌ Error running device manager: {e}")
         return False
@@ -63,23 +59,26 @@ def display_frames():
     """Display frames from Python freenect"""
     print("\n🖼️  Displaying frames for 10 seconds...")
     
-    start_time = time.time()
+    start_time = time.monotonic()
     frame_count = 0
     
-    while time.time() - start_time < 10:
+    # Fixed 30 fps schedule; sleep only for whatever slack the frame leaves
+    frame_interval = 1 / 30
+    next_deadline = start_time + frame_interval
+    
+    preview = FramePreview(video_window='RGB', depth_band=PREVIEW_DEPTH_BAND)
+    
+    while time.monotonic() - start_time < 10:
         try:
-            depth, _ = freenect.sync_get_depth()
+            # Millimeters, so the depth band and preview scale apply
+            depth, _ = freenect.sync_get_depth(format=freenect.DEPTH_MM)
             rgb, _ = freenect.sync_get_video()
             
             if depth is not None and rgb is not None:
                 frame_count += 1
                 
-                # Convert depth to displayable format
-                depth_display = cv2.convertScaleAbs(depth, alpha=0.05)
-                
                 # Display frames
-                cv2.imshow('Depth', depth_display)
-                cv2.imshow('RGB', rgb)
+                preview.show(depth, rgb)
                 
                 if cv2.waitKey(1) & 0xFF == ord('q'):
                     break
@@ -90,7 +89,13 @@ def display_frames():
             print(f"❌ Error getting frames: {e}")
             break
         
-        time.sleep(0.033)  # ~30fps
+        now = time.monotonic()
+        if next_deadline > now:
+            time.sleep(next_deadline - now)
+            next_deadline += frame_interval
+        else:
+            # Running behind - restart the schedule instead of bursting
+            next_deadline = now + frame_interval
     
     cv2.destroyAllWindows()
     print(f"✅ Displayed {frame_count} frames")
@@ -3,123 +3,51 @@ import cv2
 import numpy as np
 import time
 import math
-import random
 import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import threading
 import subprocess
+import select
+import shutil
+from operator import itemgetter
 
-class Particle:
-    def __init__(self, x, y, screen_width, screen_height):
-        self.x = x
-        self.y = y
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        
-        # Random initial velocity
-        self.vx = random.uniform(-3.0, 3.0)
-        self.vy = random.uniform(-3.0, 3.0)
-        
-        # Store initial speed for decay reference
-        self.initial_speed = math.sqrt(self.vx**2 + self.vy**2)
-        self.current_speed = self.initial_speed
-        
-        # Collision state
-        self.was_hit = False
-        self.hit_frames_ago = 0
-        
-        # Visual properties
-        self.size = 3
-        self.color = (0, 0, 255)  # Red dots (BGR format)
+class ParticleGhostingEffect:
+    # The ghost trail ring packs one slot per bit of a uint8 image, so
+    # ghost_trail_length is capped at this many frames
+    TRAIL_SLOTS = 8
     
-    def update(self, person_contours, speed_decay=0.98, min_speed=0.1, bounce_multiplier=1.5):
-        """Update particle position and handle collisions"""
-        # Check for collisions with person contours
-        self.check_collisions(person_contours, bounce_multiplier)
-        
-        # Update position
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Handle screen boundaries (bounce off edges)
-        if self.x <= 0 or self.x >= self.screen_width:
-            self.vx = -self.vx
-            self.x = max(0, min(self.screen_width, self.x))
-        
-        if self.y <= 0 or self.y >= self.screen_height:
-            self.vy = -self.vy
-            self.y = max(0, min(self.screen_height, self.y))
-        
-        # Apply speed decay if not recently hit
-        if not self.was_hit:
-            self.vx *= speed_decay
-            self.vy *= speed_decay
-            
-            # Don't let speed go below minimum
-            current_speed = math.sqrt(self.vx**2 + self.vy**2)
-            if current_speed < min_speed and current_speed > 0:
-                # Normalize and set to minimum speed
-                if current_speed > 0:
-                    self.vx = (self.vx / current_speed) * min_speed
-                    self.vy = (self.vy / current_speed) * min_speed
-        
-        # Update hit state
-        if self.was_hit:
-            self.hit_frames_ago += 1
-            if self.hit_frames_ago > 5:  # Reset hit state after 5 frames
-                self.was_hit = False
-                self.hit_frames_ago = 0
+    # Wing angles are quantized to this many steps around the circle
+    WING_ANGLE_STEPS = 64
+    
+    # Person contours are found on depth downsampled by this factor, then
+    # scaled back up to full-frame coordinates
+    CONTOUR_SCALE = 2
     
-    def check_collisions(self, person_contours, bounce_multiplier):
-        """Check if particle collides with any person contour"""
-        for contour in person_contours:
-            # Check if particle is inside the contour
-            if cv2.pointPolygonTest(contour, (self.x, self.y), False) >= 0:
-                # Calculate bounce direction (away from contour center)
-                M = cv2.moments(contour)
-                if M["m00"] > 0:
-                    cx = int(M["m10"] / M["m00"])
-                    cy = int(M["m01"] / M["m00"])
-                    
-                    # Calculate direction away from center
-                    dx = self.x - cx
-                    dy = self.y - cy
-                    distance = math.sqrt(dx**2 + dy**2)
-                    
-                    if distance > 0:
-                        # Normalize direction
-                        dx /= distance
-                        dy /= distance
-                        
-                        # Calculate bounce velocity proportional to current speed
-                        current_speed = math.sqrt(self.vx**2 + self.vy**2)
-                        bounce_speed = current_speed * bounce_multiplier
-                        
-                        # Set new velocity
-                        self.vx = dx * bounce_speed
-                        self.vy = dy * bounce_speed
-                        
-                        # Mark as hit
-                        self.was_hit = True
-                        self.hit_frames_ago = 0
-                        break
-
-class ParticleGhostingEffect:
     def __init__(self):
         # Default parameters - User's preferred settings
         self.depth_min = 217      # mm = 0.7120 feet
         self.depth_max = 3626     # mm = 11.8943 feet
+        self.update_depth_span()
         self.video_opacity = 0
         self.ghost_alpha = 0.7
         self.ghost_color = (200, 200, 255)  # Light blue ghost
         
         # Video ghosting effect settings (optimized for performance)
-        self.ghost_trail_length = 5  # Reduced from 10 to 5 for better performance
-        self.ghost_trails = []  # List to store previous silhouettes
+        self.ghost_trail_length = 5  # Reduced from 10 to 5 for better performance (max TRAIL_SLOTS)
+        # Trail ring buffer packed into one image: bit k of a pixel is set when
+        # the silhouette stored in slot k covers it
+        self._trail_bits = None
+        self._trail_len = 0  # Slots in use, rebuilt when ghost_trail_length changes
+        self._trail_idx = 0  # Next slot to overwrite
+        self._trail_count = 0
+        self._trail_luts = None  # (key, keep LUT, alpha LUT) for the current ring order
+        self._trail_weights = None  # (keep, alpha) images, reset when the ring changes
         self.silhouette_alpha = 0.4  # Increased alpha since we have fewer layers
         self.silhouette_color = (255, 255, 255)  # White silhouettes
+        self._color_plate = None  # Frame filled with silhouette_color, built on first use
+        self._ghost_cache = {}  # (sprite id, ghost size) -> resized ghost sprite
         
         # Performance optimization settings
         self.frame_skip = 2  # Process every 2nd frame for silhouette detection
@@ -127,8 +55,25 @@ class ParticleGhostingEffect:
         self.last_silhouette = None
         
         # Particle system settings
+        # Particles are stored as parallel arrays (one entry per particle)
+        # so the per-frame update runs as whole-array NumPy operations
         self.particle_count = 100
-        self.particles = []
+        self.screen_width = 640
+        self.screen_height = 480
+        self.px = np.empty(0, dtype=np.float32)
+        self.py = np.empty(0, dtype=np.float32)
+        self.vx = np.empty(0, dtype=np.float32)
+        self.vy = np.empty(0, dtype=np.float32)
+        self.was_hit = np.empty(0, dtype=bool)
+        self.hit_frames_ago = np.empty(0, dtype=np.int32)
+        self.rng = np.random.default_rng()
+        
+        # Collision label image and contour centers, rebuilt every frame_skip frames
+        self._collision_labels = None
+        self._collision_centers = None
+        
+        # Wing outlines/bones keyed by (span, height, angle bucket, side)
+        self._wing_templates = {}
         self.min_speed = 0.5
         self.max_speed = 3.0
         self.speed_decay = 0.98
@@ -139,11 +84,22 @@ class ParticleGhostingEffect:
         self.background_image = None
         self.capture_background = False
         self.debug_mode = False  # Default to off
+        self._panels = None  # Control panel images keyed by debug_mode
+        
+        # Background capture thread; latest_frames holds the newest
+        # (depth, rgb) pair and frame_seq counts how many have arrived
+        self.capture_thread = None
+        self.capture_running = False
+        self.latest_frames = (None, None)
+        self.frame_seq = 0
+        self._frame_cond = threading.Condition()
         
         # Time exposure settings (3-second capture with noise reduction)
         self.time_exposure_duration = 10.0  # 3 seconds
         self.time_exposure_start_time = None
-        self.time_exposure_frames_list = []
+        # Running float32 sum of the captured frames and how many were added
+        self.time_exposure_sum = None
+        self.time_exposure_count = 0
         
         # Initialize Kinect
         self.initialize_kinect()
@@ -190,11 +146,17 @@ class ParticleGhostingEffect:
             camtest_path = "./libfreenect/build/bin/freenect-camtest"
             if os.path.exists(camtest_path):
                 print("   Running Kinect reset...")
-                # Run the command for 3 seconds then stop it
-                process = subprocess.Popen([camtest_path], 
+                # Run the command until it reports its first frame (at most
+                # 3 seconds) then stop it. camtest's printf output is block
+                # buffered into a pipe, so run it under stdbuf -oL to get each
+                # line as it is printed; without stdbuf this waits the full 3s
+                command = [camtest_path]
+                if shutil.which("stdbuf"):
+                    command = ["stdbuf", "-oL"] + command
+                process = subprocess.Popen(command, 
                                          stdout=subprocess.PIPE, 
-                                         stderr=subprocess.PIPE)
-                time.sleep(3)  # Let it run for 3 seconds
+                                         stderr=subprocess.DEVNULL)
+                select.select([process.stdout], [], [], 3.0)
                 process.terminate()  # Stop it
                 process.wait()
                 print("   ✅ Kinect reset complete!")
@@ -205,60 +167,180 @@ class ParticleGhostingEffect:
             print(f"   ⚠️  Kinect reset failed: {e}")
             print("   Continuing anyway...")
         
-        # Give the system a moment to stabilize
-        time.sleep(0.5)
-        
-        # Give the system a moment to settle
-        time.sleep(1)
+        # Wait for the device to come back by polling for a depth frame
+        # (up to 1.5 seconds, the old fixed settle time)
+        deadline = time.monotonic() + 1.5
+        while time.monotonic() < deadline:
+            if self.get_depth_data() is not None:
+                break
+            time.sleep(0.05)
     
     def initialize_particles(self):
         """Initialize particle system"""
         print(f"🎆 Initializing {self.particle_count} particles...")
-        self.particles = []
-        
-        # Create particles with random positions and velocities
-        for i in range(self.particle_count):
-            # Random position within screen bounds (assuming 640x480 for now)
-            x = random.randint(0, 640)
-            y = random.randint(0, 480)
-            
-            # Create particle with random velocity within speed range
-            particle = Particle(x, y, 640, 480)
-            
-            # Set random velocity within speed range
-            speed = random.uniform(self.min_speed, self.max_speed)
-            angle = random.uniform(0, 2 * math.pi)
-            particle.vx = speed * math.cos(angle)
-            particle.vy = speed * math.sin(angle)
-            particle.initial_speed = speed
-            
-            self.particles.append(particle)
+        n = self.particle_count
+        (self.px, self.py, self.vx, self.vy,
+         self.was_hit, self.hit_frames_ago) = self.spawn_particles(n)
         
-        print(f"✅ {len(self.particles)} particles initialized!")
+        print(f"✅ {n} particles initialized!")
+    
+    def spawn_particles(self, n):
+        """Return (px, py, vx, vy, was_hit, hit_frames_ago) arrays for n new particles"""
+        rng = self.rng
+        
+        # Random positions and velocities within the speed range
+        px = rng.uniform(0, self.screen_width, n).astype(np.float32)
+        py = rng.uniform(0, self.screen_height, n).astype(np.float32)
+        speed = rng.uniform(self.min_speed, self.max_speed, n).astype(np.float32)
+        angle = rng.uniform(0, 2 * np.pi, n).astype(np.float32)
+        return (px, py, speed * np.cos(angle), speed * np.sin(angle),
+                np.zeros(n, dtype=bool), np.zeros(n, dtype=np.int32))
     
-    def update_particles(self, person_contours):
+    def resize_particles(self, n):
+        """Grow or shrink the particle arrays to n, keeping existing particles"""
+        arrays = (self.px, self.py, self.vx, self.vy, self.was_hit, self.hit_frames_ago)
+        old = len(self.px)
+        if n > old:
+            extra = self.spawn_particles(n - old)
+            arrays = [np.concatenate((a, e)) for a, e in zip(arrays, extra)]
+        else:
+            arrays = [a[:n] for a in arrays]
+        self.px, self.py, self.vx, self.vy, self.was_hit, self.hit_frames_ago = arrays
+    
+    def check_particle_collisions(self, person_contours, person_centers, refresh=True):
+        """Bounce particles that are inside a person contour away from its center.
+        
+        person_centers holds the (cx, cy) centroid of each contour, as
+        already computed by find_all_person_blobs. With refresh=False the
+        label image and centers from the last refresh are reused instead of
+        rasterizing the contours again.
+        """
+        if refresh:
+            self.rasterize_collision_labels(person_contours, person_centers)
+        labels, centers = self._collision_labels, self._collision_centers
+        if labels is None or len(self.px) == 0:
+            return
+        
+        # One lookup for every particle instead of a pointPolygonTest each
+        ix = np.clip(self.px.astype(np.int32), 0, self.screen_width - 1)
+        iy = np.clip(self.py.astype(np.int32), 0, self.screen_height - 1)
+        hit_label = labels[iy, ix]
+        idx = np.flatnonzero(hit_label)
+        if len(idx) == 0:
+            return
+        
+        # Calculate bounce direction (away from contour center)
+        center = centers[hit_label[idx]]
+        dx = self.px[idx] - center[:, 0]
+        dy = self.py[idx] - center[:, 1]
+        distance = np.hypot(dx, dy)
+        moving = distance > 0
+        idx, dx, dy, distance = idx[moving], dx[moving], dy[moving], distance[moving]
+        
+        # Bounce velocity proportional to current speed; one divide scales
+        # both components of the direction
+        scale = np.hypot(self.vx[idx], self.vy[idx]) * self.bounce_multiplier / distance
+        self.vx[idx] = dx * scale
+        self.vy[idx] = dy * scale
+        
+        # Mark as hit
+        self.was_hit[idx] = True
+        self.hit_frames_ago[idx] = 0
+    
+    def rasterize_collision_labels(self, person_contours, person_centers):
+        """Cache a label image (contour i -> i + 1) and the matching centers"""
+        if not person_contours:
+            self._collision_labels = None
+            self._collision_centers = None
+            return
+        
+        # Drawing in reverse lets earlier contours win where they overlap,
+        # matching the old first-match order
+        labels = np.zeros((self.screen_height, self.screen_width), dtype=np.uint8)
+        for i in range(len(person_contours) - 1, -1, -1):
+            cv2.drawContours(labels, person_contours, i, i + 1, thickness=cv2.FILLED)
+        
+        # Row i + 1 holds the center of contour i (row 0 pads label 0)
+        centers = np.empty((len(person_centers) + 1, 2), dtype=np.float32)
+        centers[1:] = person_centers
+        
+        self._collision_labels = labels
+        self._collision_centers = centers
+    
+    def update_particles(self, person_contours, person_centers, refresh_collisions=True):
         """Update all particles with collision detection"""
-        for particle in self.particles:
-            particle.update(person_contours, self.speed_decay, self.min_speed_threshold, self.bounce_multiplier)
+        self.check_particle_collisions(person_contours, person_centers, refresh_collisions)
+        px, py, vx, vy = self.px, self.py, self.vx, self.vy
+        was_hit, hit_frames_ago = self.was_hit, self.hit_frames_ago
+        
+        # Masked updates go through ufunc where= so they run in place
+        # without gathering/scattering the selected particles
+        
+        # Update position
+        px += vx
+        py += vy
+        
+        # Handle screen boundaries (bounce off edges)
+        np.negative(vx, out=vx, where=(px <= 0) | (px >= self.screen_width))
+        np.clip(px, 0, self.screen_width, out=px)
+        np.negative(vy, out=vy, where=(py <= 0) | (py >= self.screen_height))
+        np.clip(py, 0, self.screen_height, out=py)
+        
+        # Apply speed decay if not recently hit
+        free = ~was_hit
+        np.multiply(vx, self.speed_decay, out=vx, where=free)
+        np.multiply(vy, self.speed_decay, out=vy, where=free)
+        
+        # Don't let speed go below minimum - normalize and set to minimum speed
+        speed = np.hypot(vx, vy)
+        slow = free & (speed < self.min_speed_threshold) & (speed > 0)
+        np.divide(self.min_speed_threshold, speed, out=speed, where=slow)
+        np.multiply(vx, speed, out=vx, where=slow)
+        np.multiply(vy, speed, out=vy, where=slow)
+        
+        # Update hit state, resetting it after 5 frames
+        np.add(hit_frames_ago, 1, out=hit_frames_ago, where=was_hit)
+        expired = was_hit & (hit_frames_ago > 5)
+        np.copyto(was_hit, False, where=expired)
+        np.copyto(hit_frames_ago, 0, where=expired)
     
     def render_particles(self, output_frame):
         """Render all particles as animated SVG-style bats"""
-        for particle in self.particles:
-            self.draw_svg_bat(output_frame, particle)
-    
-    def draw_svg_bat(self, frame, particle):
-        """Draw an animated SVG-style bat based on the reference design"""
-        x, y = int(particle.x), int(particle.y)
+        # Bodies and wings are filled per bat (one fillPoly call can't hold
+        # overlapping shapes - they cancel out), while the bones and eyes of
+        # every bat are collected and drawn on top in batched calls
+        bones = []
+        eyes = []
+        
+        # Speeds, wing flap phases and headings for every bat in array calls
+        # (atan2(0, 0) is 0, so resting bats need no special case)
+        speed = np.hypot(self.vx, self.vy)
+        wing_flap = np.sin(time.time() * 8 + speed * 3) * 0.3
+        body_angle = np.arctan2(self.vy, self.vx)
+        
+        for x, y, s, flap, angle in zip(self.px.tolist(), self.py.tolist(), speed.tolist(),
+                                        wing_flap.tolist(), body_angle.tolist()):
+            self.draw_svg_bat(output_frame, x, y, s, flap, angle, bones, eyes)
+        
+        if bones:
+            bone_color = (100, 100, 100)  # Light gray for bones
+            cv2.polylines(output_frame, np.concatenate(bones), False, bone_color, 1)
         
-        # Calculate wing flap based on speed and time
-        current_speed = math.sqrt(particle.vx**2 + particle.vy**2)
-        wing_flap = math.sin(time.time() * 8 + current_speed * 3) * 0.3
+        # Draw glowing eyes
+        eye_color = (0, 255, 255)  # Cyan glow
+        circle = cv2.circle
+        for center, eye_size in eyes:
+            circle(output_frame, center, eye_size, eye_color, -1)
+    
+    def draw_svg_bat(self, frame, px, py, current_speed, wing_flap, body_angle, bones, eyes):
+        """Draw an animated SVG-style bat based on the reference design.
         
-        # Calculate body rotation based on movement direction
-        if particle.vx != 0 or particle.vy != 0:
-            body_angle = math.atan2(particle.vy, particle.vx)
-        else:
-            body_angle = 0
+        current_speed, wing_flap and body_angle (radians, from the velocity)
+        come precomputed from render_particles.
+        The bat's bone segments and eyes are appended to bones and eyes for
+        render_particles to draw in bulk.
+        """
+        x, y = int(px), int(py)
         
         # Bat size based on speed
         base_size = 8
@@ -271,15 +353,14 @@ class ParticleGhostingEffect:
                    int(math.degrees(body_angle)), 0, 360, body_color, -1)
         
         # Draw wings with detailed structure
-        self.draw_bat_wings(frame, x, y, size, wing_flap, body_angle, particle)
+        self.draw_bat_wings(frame, x, y, size, wing_flap, body_angle, bones)
         
-        # Draw glowing eyes
-        eye_color = (0, 255, 255)  # Cyan glow
+        # Glowing eyes
         eye_size = max(1, size // 8)
-        cv2.circle(frame, (x - size//6, y - size//8), eye_size, eye_color, -1)
-        cv2.circle(frame, (x + size//6, y - size//8), eye_size, eye_color, -1)
+        eyes.append(((x - size//6, y - size//8), eye_size))
+        eyes.append(((x + size//6, y - size//8), eye_size))
     
-    def draw_bat_wings(self, frame, x, y, size, wing_flap, body_angle, particle):
+    def draw_bat_wings(self, frame, x, y, size, wing_flap, body_angle, bones):
         """Draw detailed bat wings with bone structure like the reference"""
         # Wing parameters
         wing_span = size * 2
@@ -291,42 +372,59 @@ class ParticleGhostingEffect:
         
         # Draw left wing
         self.draw_detailed_wing(frame, x, y, wing_span, wing_height, 
-                              left_wing_angle, particle, "left")
+                              left_wing_angle, "left", bones)
         
         # Draw right wing  
         self.draw_detailed_wing(frame, x, y, wing_span, wing_height,
-                              right_wing_angle, particle, "right")
+                              right_wing_angle, "right", bones)
     
-    def draw_detailed_wing(self, frame, x, y, span, height, angle, particle, side):
-        """Draw a detailed wing with bone structure and scalloped edges"""
+    def draw_detailed_wing(self, frame, x, y, span, height, angle, side, bones):
+        """Draw a wing with scalloped edges; its bone segments go into bones"""
         # Wing color
         wing_color = (30, 30, 30)  # Dark gray
-        bone_color = (100, 100, 100)  # Light gray for bones
-        
-        # Calculate wing points
-        cos_a, sin_a = math.cos(angle), math.sin(angle)
-        
-        # Wing base (connected to body)
-        base_x = x + int(span//4 * cos_a)
-        base_y = y + int(span//4 * sin_a)
-        
-        # Wing tip
-        tip_x = x + int(span * cos_a)
-        tip_y = y + int(span * sin_a)
-        
-        # Wing top edge (curved)
-        top_x = x + int(span//2 * cos_a)
-        top_y = y + int(span//2 * sin_a) - height//2
         
-        # Create wing outline with scalloped edges
-        wing_points = self.create_scalloped_wing_outline(base_x, base_y, tip_x, tip_y, top_x, top_y, side)
+        # Wing shape relative to the body, cached per size/angle bucket/side
+        angle_idx = int(round(angle * self.WING_ANGLE_STEPS / (2 * math.pi))) % self.WING_ANGLE_STEPS
+        wing_points, bone_segments = self.get_wing_template(span, height, angle_idx, side)
+        offset = np.array([x, y], dtype=np.int32)
         
         # Draw wing fill
         if len(wing_points) > 2:
-            cv2.fillPoly(frame, [np.array(wing_points, dtype=np.int32)], wing_color)
+            cv2.fillPoly(frame, [wing_points + offset], wing_color)
         
-        # Draw bone structure (detailed lines like reference)
-        self.draw_wing_bones(frame, base_x, base_y, tip_x, tip_y, top_x, top_y, bone_color)
+        # Bone structure (detailed lines like reference)
+        bones.append(bone_segments + offset)
+    
+    def get_wing_template(self, span, height, angle_idx, side):
+        """Return (outline, bone segments) for a wing centered on (0, 0).
+        
+        The wing geometry only depends on its size, quantized angle and side,
+        so it is built once per combination and translated at draw time.
+        """
+        key = (span, height, angle_idx, side)
+        template = self._wing_templates.get(key)
+        if template is None:
+            angle = angle_idx * 2 * math.pi / self.WING_ANGLE_STEPS
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            
+            # Wing base (connected to body)
+            base_x = int(span//4 * cos_a)
+            base_y = int(span//4 * sin_a)
+            
+            # Wing tip
+            tip_x = int(span * cos_a)
+            tip_y = int(span * sin_a)
+            
+            # Wing top edge (curved)
+            top_x = int(span//2 * cos_a)
+            top_y = int(span//2 * sin_a) - height//2
+            
+            # Create wing outline with scalloped edges
+            wing_points = self.create_scalloped_wing_outline(base_x, base_y, tip_x, tip_y, top_x, top_y, side)
+            bone_segments = self.create_wing_bone_segments(base_x, base_y, tip_x, tip_y)
+            template = (np.array(wing_points, dtype=np.int32), np.array(bone_segments, dtype=np.int32))
+            self._wing_templates[key] = template
+        return template
     
     def create_scalloped_wing_outline(self, base_x, base_y, tip_x, tip_y, top_x, top_y, side):
         """Create wing outline with scalloped edges like the reference"""
@@ -358,35 +456,37 @@ class ParticleGhostingEffect:
         
         return points
     
-    def draw_wing_bones(self, frame, base_x, base_y, tip_x, tip_y, top_x, top_y, bone_color):
-        """Draw wing bone structure like the reference"""
+    def create_wing_bone_segments(self, base_x, base_y, tip_x, tip_y):
+        """Create the wing bone structure like the reference as line segments"""
         # Main bone (from base to tip)
-        cv2.line(frame, (base_x, base_y), (tip_x, tip_y), bone_color, 1)
+        segments = [[[base_x, base_y], [tip_x, tip_y]]]
         
         # Secondary bones (from base to various points)
         for i in range(3):
             t = (i + 1) / 4
             bone_x = int(base_x + (tip_x - base_x) * t)
             bone_y = int(base_y + (tip_y - base_y) * t)
-            
-            # Draw bone line
-            cv2.line(frame, (base_x, base_y), (bone_x, bone_y), bone_color, 1)
+            segments.append([[base_x, base_y], [bone_x, bone_y]])
             
             # Add small branches
             branch_x = bone_x + (5 if i % 2 == 0 else -5)
             branch_y = bone_y + 2
-            cv2.line(frame, (bone_x, bone_y), (branch_x, branch_y), bone_color, 1)
+            segments.append([[bone_x, bone_y], [branch_x, branch_y]])
+        
+        return segments
 
     def update_min_distance_feet(self, val):
         """Update min distance from trackbar"""
         feet = val / 10000.0
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Min distance set to {feet:.4f} feet ({self.depth_min}mm)")
 
     def update_max_distance_feet(self, val):
         """Update max distance from trackbar"""
         feet = val / 10000.0
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Max distance set to {feet:.4f} feet ({self.depth_max}mm)")
 
     def update_video_opacity(self, val):
@@ -399,8 +499,8 @@ class ParticleGhostingEffect:
         if val != self.particle_count:
             self.particle_count = val
             print(f"Particle count set to {self.particle_count}")
-            # Reinitialize particles with new count
-            self.initialize_particles()
+            # Add or drop particles at the end; the rest keep flying
+            self.resize_particles(self.particle_count)
     
     def update_min_speed(self, val):
         """Update minimum speed from trackbar"""
@@ -412,38 +512,26 @@ class ParticleGhostingEffect:
         self.max_speed = val / 10.0
         print(f"Max speed set to {self.max_speed:.1f}")
     
-    def average_frames(self, frames_list):
-        """Average multiple frames to create a higher quality background image"""
-        if not frames_list:
+    def average_frames(self, frame_sum, frame_count):
+        """Average accumulated frames to create a higher quality background image"""
+        if frame_sum is None or frame_count == 0:
             return None
         
-        # Convert frames to float for averaging
-        float_frames = [frame.astype(np.float32) for frame in frames_list]
-        
-        # Calculate the average
-        averaged = np.mean(float_frames, axis=0)
+        # Divide the running sum and convert back to uint8
+        result = np.clip(frame_sum / frame_count, 0, 255).astype(np.uint8)
         
-        # Convert back to uint8
-        result = np.clip(averaged, 0, 255).astype(np.uint8)
-        
-        print(f"⏱️ Averaged {len(frames_list)} frames for improved quality")
+        print(f"⏱️ Averaged {frame_count} frames for improved quality")
         return result
     
-    def average_frames_with_noise_reduction(self, frames_list):
-        """Average multiple frames with noise reduction for high-quality background"""
-        if not frames_list:
+    def average_frames_with_noise_reduction(self, frame_sum, frame_count):
+        """Average accumulated frames with noise reduction for high-quality background"""
+        if frame_sum is None or frame_count == 0:
             return None
         
-        print(f"⏱️ Processing {len(frames_list)} frames with noise reduction...")
-        
-        # Convert frames to float for processing
-        float_frames = [frame.astype(np.float32) for frame in frames_list]
-        
-        # Calculate the average
-        averaged = np.mean(float_frames, axis=0)
+        print(f"⏱️ Processing {frame_count} frames with noise reduction...")
         
-        # Convert back to uint8 for OpenCV processing
-        averaged_uint8 = np.clip(averaged, 0, 255).astype(np.uint8)
+        # Divide the running sum and convert back to uint8 for OpenCV processing
+        averaged_uint8 = np.clip(frame_sum / frame_count, 0, 255).astype(np.uint8)
         
         # Apply noise reduction using bilateral filter
         # This preserves edges while reducing noise
@@ -452,7 +540,7 @@ class ParticleGhostingEffect:
         # Additional Gaussian blur for extra smoothness (optional)
         # noise_reduced = cv2.GaussianBlur(noise_reduced, (3, 3), 0)
         
-        print(f"⏱️ Applied noise reduction to {len(frames_list)} frames")
+        print(f"⏱️ Applied noise reduction to {frame_count} frames")
         return noise_reduced
 
 
@@ -472,14 +560,28 @@ class ParticleGhostingEffect:
             elif 50 <= x <= 80 and 200 <= y <= 230:
                 self.debug_mode = not self.debug_mode
                 print(f"🔧 Debug mode {'enabled' if self.debug_mode else 'disabled'}")
-                # Redraw the control panel to update checkbox state
+                # Show the control panel variant for the new checkbox state
                 self.create_static_control_panel()
             
             else:
                 print(f"Click outside interactive areas")
     
     def create_static_control_panel(self):
-        """Create the static control panel with button and checkbox"""
+        """Show the static control panel for the current debug mode.
+        
+        Both checkbox states are drawn once on the first call; later calls
+        (checkbox clicks) only swap which one is shown.
+        """
+        first_show = self._panels is None
+        if first_show:
+            self._panels = {debug: self.draw_control_panel(debug) for debug in (False, True)}
+        
+        cv2.imshow('Control Panel', self._panels[self.debug_mode])
+        if first_show:
+            cv2.waitKey(1)  # Ensure the window is displayed
+    
+    def draw_control_panel(self, debug_mode):
+        """Draw the control panel with button and checkbox"""
         # Create a black background
         panel = np.zeros((350, 500, 3), dtype=np.uint8)
         
@@ -493,7 +595,7 @@ class ParticleGhostingEffect:
                      (255, 255, 255), 2)
         
         # Checkbox fill if checked
-        if self.debug_mode:
+        if debug_mode:
             cv2.rectangle(panel, (checkbox_x + 3, checkbox_y + 3), 
                          (checkbox_x + checkbox_size - 3, checkbox_y + checkbox_size - 3), 
                          (0, 255, 0), -1)
@@ -516,20 +618,20 @@ class ParticleGhostingEffect:
         cv2.putText(panel, 'Click "Capture BG" for high-quality background (3-second capture)', (10, 340), 
                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
-        # Show the static panel once
-        cv2.imshow('Control Panel', panel)
-        cv2.waitKey(1)  # Ensure the window is displayed
+        return panel
 
     def update_min_distance_ui(self, val):
         """Update min distance from UI slider"""
         feet = float(val)
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         self.min_dist_label.config(text=f"{feet:.4f} ft")
         
     def update_max_distance_ui(self, val):
         """Update max distance from UI slider"""
         feet = float(val)
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         self.max_dist_label.config(text=f"{feet:.4f} ft")
         
     def update_video_opacity_ui(self, val):
@@ -590,12 +692,14 @@ Instructions:
         # Convert from feet*10000 back to mm
         feet = val / 10000.0
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Min distance set to {feet:.4f} feet ({self.depth_min}mm)")
 
     def update_max_distance_feet(self, val):
         # Convert from feet*10000 back to mm
         feet = val / 10000.0
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Max distance set to {feet:.4f} feet ({self.depth_max}mm)")
 
     def update_video_opacity(self, val):
@@ -628,14 +732,12 @@ Instructions:
 
     def create_silhouette_from_depth(self, depth_map, person_mask):
         """Create a silhouette from the depth map for the detected person"""
-        # Create a silhouette by using the person mask
-        silhouette = np.zeros_like(depth_map, dtype=np.uint8)
-        silhouette[person_mask] = 255
-        
-        # Convert to 3-channel for blending
-        silhouette_3ch = cv2.cvtColor(silhouette, cv2.COLOR_GRAY2BGR)
+        # Create a silhouette by using the person mask - accepts the 0/255
+        # inRange mask as-is, or a bool mask viewed as 0/1 bytes
+        _, silhouette = cv2.threshold(person_mask.view(np.uint8), 0, 255, cv2.THRESH_BINARY)
         
-        return silhouette_3ch
+        # Stays single-channel - the color is applied when blending
+        return silhouette
 
     def get_depth_data(self):
         """Get depth data from Kinect"""
@@ -659,14 +761,57 @@ Instructions:
             # Don't print every error to avoid spam
             return None
 
+    def start_capture(self):
+        """Start reading Kinect frames on a background thread"""
+        self.capture_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+    
+    def stop_capture(self):
+        """Stop the capture thread and wait for it to exit"""
+        self.capture_running = False
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=1.0)
+            self.capture_thread = None
+    
+    def _capture_loop(self):
+        """Fetch depth + RGB pairs so USB transfers overlap the rendering"""
+        while self.capture_running:
+            depth = self.get_depth_data()
+            rgb = self.get_rgb_data()
+            if depth is None or rgb is None:
+                time.sleep(0.1)
+                continue
+            with self._frame_cond:
+                self.latest_frames = (depth, rgb)
+                self.frame_seq += 1
+                self._frame_cond.notify_all()
+    
+    def wait_for_frames(self, last_seq, timeout=0.1):
+        """Return (depth, rgb, seq) once a pair newer than last_seq arrives.
+        
+        Returns (None, None, last_seq) if nothing new shows up in time.
+        """
+        with self._frame_cond:
+            if not self._frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout):
+                return None, None, last_seq
+            depth, rgb = self.latest_frames
+            return depth, rgb, self.frame_seq
+
     def find_person_center(self, depth):
         """Find the center of the largest person-like object"""
-        # Create mask for objects within depth range
-        mask = (depth > self.depth_min) & (depth < self.depth_max)
-        mask = mask.astype(np.uint8) * 255
-        
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Create mask for objects within depth range (inRange is inclusive,
+        # so shift the bounds to keep the strict comparison)
+        scale = self.CONTOUR_SCALE
+        depth_small = cv2.resize(depth, None, fx=1 / scale, fy=1 / scale,
+                                 interpolation=cv2.INTER_NEAREST)
+        mask_small = cv2.inRange(depth_small, self.depth_min + 1, self.depth_max - 1)
+        mask = cv2.resize(mask_small, (depth.shape[1], depth.shape[0]),
+                          interpolation=cv2.INTER_NEAREST)
+        
+        # Find contours at low resolution, in full-frame coordinates
+        contours, _ = cv2.findContours(mask_small, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        contours = [c * scale for c in contours]
         
         if not contours:
             return None, None, mask
@@ -690,24 +835,93 @@ Instructions:
         
         return None, None, mask
 
+    def update_depth_span(self):
+        """Cache the depth_min..depth_max span used by normalize_depth.
+        
+        Called whenever a distance slider moves, so the per-frame path
+        doesn't recompute it. Also caches the raw depth cutoff for person
+        detection: normalize_depth(d) > 200 exactly when 0 < d <= cutoff.
+        With depth_max <= depth_min every pixel normalizes to 0, so the
+        cutoff is 0 and nothing is detected.
+        """
+        self._depth_span = max(self.depth_max - self.depth_min, 1)
+        if self.depth_max <= self.depth_min:
+            self._person_depth_cutoff = 0
+        else:
+            self._person_depth_cutoff = self.depth_max - -(-201 * self._depth_span // 255)
+    
     def normalize_depth(self, depth_mm):
         """Normalize depth to 0-255 gradient like kinect_viewer"""
-        d = depth_mm.copy().astype(np.float32)
-        d[d <= 0] = np.nan
-        near, far = float(self.depth_min), float(self.depth_max)
-        d = np.clip(d, near, far)
-        d = (d - near) / (far - near)  # 0..1
-        d = (1.0 - d) * 255.0          # invert so near = bright
-        d[np.isnan(d)] = 0
-        return d.astype(np.uint8)
+        near, far, span = self.depth_min, self.depth_max, self._depth_span
+        
+        # Integer map, inverted so near = bright: (far - d) * 255 // (far - near)
+        d = np.clip(depth_mm, near, far).astype(np.uint32)
+        np.subtract(far, d, out=d)
+        d *= 255
+        d //= span
+        out = d.astype(np.uint8)
+        
+        # No reading stays black
+        np.copyto(out, 0, where=depth_mm == 0)
+        return out
     
     def add_silhouette_to_trail(self, silhouette):
-        """Add a silhouette to the ghost trail"""
-        self.ghost_trails.append(silhouette.copy())
+        """Add a 0/255 silhouette to the ghost trail, overwriting the oldest slot"""
+        length = min(self.ghost_trail_length, self.TRAIL_SLOTS)
+        if (self._trail_bits is None or self._trail_bits.shape != silhouette.shape
+                or self._trail_len != length):
+            # Start a fresh ring; old slot bits and LUTs don't match the new order
+            self._trail_bits = np.zeros(silhouette.shape, dtype=np.uint8)
+            self._trail_len = length
+            self._trail_idx = 0
+            self._trail_count = 0
+            self._trail_luts = None
+        
+        bit = np.uint8(1 << self._trail_idx)
+        np.bitwise_and(self._trail_bits, ~bit, out=self._trail_bits)
+        np.bitwise_or(self._trail_bits, np.bitwise_and(silhouette, bit), out=self._trail_bits)
         
         # Keep only the last N frames
-        if len(self.ghost_trails) > self.ghost_trail_length:
-            self.ghost_trails.pop(0)
+        self._trail_idx = (self._trail_idx + 1) % self._trail_len
+        self._trail_count = min(self._trail_count + 1, self._trail_len)
+        self._trail_weights = None
+    
+    def composite_ghost_trails(self, output):
+        """Blend every trail silhouette over output in a single pass.
+        
+        Stacking the layers oldest to newest leaves each pixel at
+        output * keep + color * (1 - keep), where keep is the product of
+        (1 - opacity) over the layers covering it. keep only depends on the
+        pixel's slot bits, so it comes from a 256-entry table.
+        """
+        n = self._trail_count
+        if n == 0:
+            return output
+        
+        key = (self._trail_idx, n, self.silhouette_alpha)
+        if self._trail_luts is None or self._trail_luts[0] != key:
+            codes = np.arange(256)
+            keep = np.ones(256, dtype=np.float32)
+            for age in range(n):
+                # Newer silhouettes are more opaque
+                slot = (self._trail_idx - n + age) % self._trail_len
+                opacity = self.silhouette_alpha * (age + 1) / n
+                keep[(codes >> slot) & 1 == 1] *= 1 - opacity
+            self._trail_luts = (key, keep.reshape(1, 256), (1 - keep).reshape(1, 256))
+            self._trail_weights = None
+        
+        # Per-pixel weights only change when a silhouette is added, so frames
+        # where nobody is detected reuse them and just redo the blend
+        if self._trail_weights is None:
+            _, keep_lut, alpha_lut = self._trail_luts
+            self._trail_weights = (cv2.LUT(self._trail_bits, keep_lut),
+                                   cv2.LUT(self._trail_bits, alpha_lut))
+        keep_weights, alpha_weights = self._trail_weights
+        
+        if self._color_plate is None or self._color_plate.shape != output.shape:
+            self._color_plate = np.full(output.shape, self.silhouette_color, dtype=np.uint8)
+        
+        return cv2.blendLinear(output, self._color_plate, keep_weights, alpha_weights)
     
     
     def track_people(self, current_blobs):
@@ -719,47 +933,29 @@ Instructions:
             self.previous_blobs = []
             self.person_counter = 0
         
-        # Match current blobs to previous blobs
-        matched = [False] * len(current_blobs)
-        for prev_id, prev_blob in enumerate(self.previous_blobs):
-            px, py = prev_blob['center']
-            min_dist = float('inf')
-            best_match = None
+        # Match current blobs to previous blobs. All pairwise squared distances
+        # come from one broadcast; the greedy pass then just masks out columns
+        # that are already taken.
+        matched = np.zeros(len(current_blobs), dtype=bool)
+        if self.previous_blobs and current_blobs:
+            prev_centers = np.array([b['center'] for b in self.previous_blobs], dtype=np.float32)
+            cur_centers = np.array([(b[0], b[1]) for b in current_blobs], dtype=np.float32)
+            d2 = ((prev_centers[:, None, :] - cur_centers[None, :, :]) ** 2).sum(axis=2)
             
-            for i, blob_data in enumerate(current_blobs):
-                if matched[i]:
-                    continue
-                # Extract coordinates from blob data
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                
-                dist = np.sqrt((cx - px)**2 + (cy - py)**2)
-                if dist < min_dist and dist < 100:  # Threshold for matching
-                    min_dist = dist
-                    best_match = i
-            
-            if best_match is not None:
-                matched[best_match] = True
-                # Reuse the previous person ID
-                blob_data = current_blobs[best_match]
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                current_blobs[best_match] = (cx, cy, blob_depth, contour, prev_blob['id'])
+            for prev_id, prev_blob in enumerate(self.previous_blobs):
+                row = np.where(matched, np.inf, d2[prev_id])
+                best_match = int(row.argmin())
+                if row[best_match] < 100 ** 2:  # Threshold for matching
+                    matched[best_match] = True
+                    # Reuse the previous person ID
+                    cx, cy, blob_depth, contour = current_blobs[best_match][:4]
+                    current_blobs[best_match] = (cx, cy, blob_depth, contour, prev_blob['id'])
         
         # Assign new IDs to unmatched blobs
-        for i, is_matched in enumerate(matched):
-            if not is_matched:
-                blob_data = current_blobs[i]
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                self.person_counter += 1
-                current_blobs[i] = (cx, cy, blob_depth, contour, self.person_counter)
+        for i in np.flatnonzero(~matched):
+            cx, cy, blob_depth, contour = current_blobs[i][:4]
+            self.person_counter += 1
+            current_blobs[i] = (cx, cy, blob_depth, contour, self.person_counter)
         
         # Update previous blobs
         self.previous_blobs = [{'center': (cx, cy), 'id': pid} for cx, cy, _, _, pid in current_blobs]
@@ -768,22 +964,28 @@ Instructions:
     
     def find_all_person_blobs(self, depth):
         """Find all person-like blobs in the depth map using gradient"""
-        # Normalize depth to 0-255 gradient (like kinect_viewer)
-        depth_normalized = self.normalize_depth(depth)
+        # Work at reduced resolution - person-sized blobs don't need every pixel
+        scale = self.CONTOUR_SCALE
+        depth_small = cv2.resize(depth, None, fx=1 / scale, fy=1 / scale,
+                                 interpolation=cv2.INTER_NEAREST)
         
-        # Threshold to find bright areas (white = person/subject)
-        # Subject is white in the normalized depth (bright = close), so threshold for bright pixels
-        # Don't invert - we want to track the white/bright objects
-        _, mask = cv2.threshold(depth_normalized, 200, 255, cv2.THRESH_BINARY)
+        # Find the areas that would be bright (> 200, white = person/subject)
+        # in the normalized gradient, by thresholding the raw depth directly
+        mask = cv2.inRange(depth_small, 1, self._person_depth_cutoff)
         
         # Find contours on the mask (white areas = people)
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        person_blobs = []
+        # (area, blob) pairs, so the sort reuses the area from the size check
+        candidates = []
         for contour in contours:
-            area = cv2.contourArea(contour)
+            # Full-frame area - scaling the contour by s scales its area by
+            # exactly s*s, so only contours that pass get scaled back up
+            area = cv2.contourArea(contour) * (scale * scale)
             # Person-like size range - adjust as needed
             if area > 5000:  # Minimum person size
+                # Back to full-frame coordinates, so centers are unchanged
+                contour = contour * scale
                 M = cv2.moments(contour)
                 if M["m00"] > 0:
                     cx = int(M["m10"] / M["m00"])
@@ -791,10 +993,11 @@ Instructions:
                     
                     if 0 <= cy < depth.shape[0] and 0 <= cx < depth.shape[1]:
                         blob_depth = depth[cy, cx]
-                        person_blobs.append((cx, cy, blob_depth, contour))
+                        candidates.append((area, (cx, cy, blob_depth, contour)))
         
         # Sort by area (largest first)
-        person_blobs.sort(key=lambda x: cv2.contourArea(x[3]), reverse=True)
+        candidates.sort(key=itemgetter(0), reverse=True)
+        person_blobs = [blob for _, blob in candidates]
         
         # Track people across frames
         person_blobs = self.track_people(person_blobs)
@@ -825,7 +1028,7 @@ Instructions:
             center_depth = (hand1[2] + hand2[2]) // 2
             
             # Calculate distance between hands
-            distance = math.sqrt((hand1[0] - hand2[0])**2 + (hand1[1] - hand2[1])**2)
+            distance = math.hypot(hand1[0] - hand2[0], hand1[1] - hand2[1])
             
             return (center_x, center_y, center_depth), distance, "between_hands"
         elif person_center is not None:
@@ -851,8 +1054,14 @@ Instructions:
             # Fixed size for person center
             ghost_size = 120
         
-        # Resize ghost sprite
-        ghost_resized = cv2.resize(self.ghost_sprite, (ghost_size, ghost_size))
+        # Resize ghost sprite; sizes are rounded to 4 px so nearby sizes share
+        # one cached resize (at most ~40 per sprite for the 50-200 px range)
+        ghost_size = max(4, (ghost_size + 2) // 4 * 4)
+        key = (id(self.ghost_sprite), ghost_size)
+        ghost_resized = self._ghost_cache.get(key)
+        if ghost_resized is None:
+            ghost_resized = cv2.resize(self.ghost_sprite, (ghost_size, ghost_size))
+            self._ghost_cache[key] = ghost_resized
         
         # Calculate position to center the ghost
         half_size = ghost_size // 2
@@ -873,11 +1082,10 @@ Instructions:
             alpha = np.ones((ghost_resized.shape[0], ghost_resized.shape[1]))
             ghost_rgb = ghost_resized
         
-        # Blend ghost with background
+        # Blend ghost with background in one OpenCV pass over all channels
         roi = image[y1:y2, x1:x2]
-        for c in range(3):
-            roi[:, :, c] = (1 - alpha * self.ghost_alpha) * roi[:, :, c] + \
-                          (alpha * self.ghost_alpha) * ghost_rgb[:, :, c]
+        a = (alpha * self.ghost_alpha).astype(np.float32)
+        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
         
         return image
 
@@ -909,11 +1117,12 @@ Instructions:
         print("Press 'q' to quit, 's' to save a frame")
         print("Looking for Kinect...")
         
+        self.start_capture()
+        seq = 0
         try:
             while True:
-                # Get data from Kinect
-                depth = self.get_depth_data()
-                rgb = self.get_rgb_data()
+                # Get the newest frames from the capture thread
+                depth, rgb, seq = self.wait_for_frames(seq)
                 
                 if depth is None or rgb is None:
                     print("Waiting for Kinect...", end='\r')
@@ -923,9 +1132,8 @@ Instructions:
                                cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
                     cv2.putText(test_output, "Make sure Kinect is plugged in and powered", (50, 280), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-                    cv2.imshow("👻 Video Ghosting Effect - Main View", test_output)
-                    cv2.imshow("🔍 Depth Map & Detection", test_output)
-                    time.sleep(0.1)
+                    cv2.imshow("🦇 Bat Particle Effect - Main View", test_output)
+                    cv2.waitKey(1)
                     continue
                 
                 # Mirror RGB feed for easier interaction
@@ -935,7 +1143,8 @@ Instructions:
                 if self.capture_background:
                     # Start time exposure capture (3 seconds)
                     self.time_exposure_start_time = time.time()
-                    self.time_exposure_frames_list = []
+                    self.time_exposure_sum = np.zeros(rgb_mirrored.shape, dtype=np.float32)
+                    self.time_exposure_count = 0
                     print(f"⏱️ Starting 3-second time exposure capture...")
                     self.capture_background = False  # Reset flag, will be handled in time exposure logic
                 
@@ -943,21 +1152,23 @@ Instructions:
                 if self.time_exposure_start_time is not None:
                     elapsed_time = time.time() - self.time_exposure_start_time
                     if elapsed_time < self.time_exposure_duration:
-                        # Still capturing - add frame to list
-                        self.time_exposure_frames_list.append(rgb_mirrored.copy())
+                        # Still capturing - add frame to the running sum
+                        cv2.accumulate(rgb_mirrored, self.time_exposure_sum)
+                        self.time_exposure_count += 1
                         remaining_time = self.time_exposure_duration - elapsed_time
-                        print(f"⏱️ Time exposure: {elapsed_time:.1f}s / {self.time_exposure_duration:.1f}s (frames: {len(self.time_exposure_frames_list)})")
+                        print(f"⏱️ Time exposure: {elapsed_time:.1f}s / {self.time_exposure_duration:.1f}s (frames: {self.time_exposure_count})")
                         
                         # Progress will be shown on the final output layer later
                     else:
                         # Time exposure complete - process frames
                         print("⏱️ Processing time exposure frames with noise reduction...")
-                        self.background_image = self.average_frames_with_noise_reduction(self.time_exposure_frames_list)
-                        print(f"✅ 3-second time exposure background captured! ({len(self.time_exposure_frames_list)} frames)")
+                        self.background_image = self.average_frames_with_noise_reduction(self.time_exposure_sum, self.time_exposure_count)
+                        print(f"✅ 3-second time exposure background captured! ({self.time_exposure_count} frames)")
                         print("You can now step in front of the camera.")
                         # Mark as completed
                         self.time_exposure_start_time = None
-                        self.time_exposure_frames_list = []
+                        self.time_exposure_sum = None
+                        self.time_exposure_count = 0
                 
                 # Create output with video opacity
                 if self.background_image is not None:
@@ -986,12 +1197,19 @@ Instructions:
                 person_blobs = self.find_all_person_blobs(depth_mirrored)
                 
                 # Update particles with collision detection
-                person_contours = [blob_data[3] for blob_data in person_blobs] if person_blobs else []
-                self.update_particles(person_contours)
+                person_contours = [blob_data[3] for blob_data in person_blobs]
+                person_centers = [(blob_data[0], blob_data[1]) for blob_data in person_blobs]
+                # Contours are only rasterized on silhouette frames; the frames in
+                # between bounce off the cached label image
+                self.update_particles(person_contours, person_centers,
+                                      refresh_collisions=should_process_silhouette)
                 
                 if person_blobs and should_process_silhouette:
-                    # Create combined silhouette from all detected people
+                    # Create combined silhouette from all detected people in one
+                    # fill (external contours never overlap)
                     combined_silhouette = np.zeros_like(depth_mirrored, dtype=np.uint8)
+                    cv2.drawContours(combined_silhouette, [blob_data[3] for blob_data in person_blobs], -1, 255,
+                                     thickness=cv2.FILLED)
                     
                     for i, blob_data in enumerate(person_blobs):
                         # Extract blob data
@@ -1006,23 +1224,16 @@ Instructions:
                         if self.debug_mode:
                             cv2.rectangle(output, (x, y), (x + w, y + h), (0, 255, 0), 2)
                         
-                        # Create mask for this person
-                        person_mask = np.zeros_like(depth_mirrored, dtype=np.uint8)
-                        cv2.fillPoly(person_mask, [contour], 255)
-                        
-                        # Add to combined silhouette
-                        combined_silhouette = cv2.bitwise_or(combined_silhouette, person_mask)
-                        
                         # Draw person number and distance (debug mode only)
                         if self.debug_mode:
                             distance_feet = blob_depth / 304.8
                             cv2.putText(output, f"Person {person_id}: {distance_feet:.2f}ft", 
                                        (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
                     
-                    # Add current silhouette to trail
-                    if np.any(combined_silhouette):
-                        self.add_silhouette_to_trail(combined_silhouette)
-                        self.last_silhouette = combined_silhouette.copy()
+                    # Add current silhouette to trail (never empty here - every
+                    # blob passed the minimum area check before being filled)
+                    self.add_silhouette_to_trail(combined_silhouette)
+                    self.last_silhouette = combined_silhouette
                 elif person_blobs and not should_process_silhouette:
                     # Use last silhouette for skipped frames
                     if self.last_silhouette is not None:
@@ -1034,18 +1245,8 @@ Instructions:
                 else:
                     output = rgb_mirrored.copy()
                 
-                # Draw all silhouettes in the trail with decreasing opacity (optimized)
-                for i, trail_silhouette in enumerate(self.ghost_trails):
-                    if np.any(trail_silhouette):
-                        # Calculate opacity (newer silhouettes are more opaque)
-                        opacity = self.silhouette_alpha * (i + 1) / len(self.ghost_trails)
-                        
-                        # Create mask for silhouette (white areas only)
-                        mask = trail_silhouette > 0
-                        
-                        # Apply silhouette with transparency using vectorized operations
-                        silhouette_color_array = np.array(self.silhouette_color, dtype=np.uint8)
-                        output[mask] = (1 - opacity) * output[mask] + opacity * silhouette_color_array
+                # Draw all silhouettes in the trail with decreasing opacity
+                output = self.composite_ghost_trails(output)
                 
                 # Display status (debug mode only)
                 if self.debug_mode:
@@ -1072,21 +1273,23 @@ Instructions:
                 # Render particles on top of everything
                 self.render_particles(output)
                 
-                # Display output
-                cv2.imshow("🦇 Bat Particle Effect - Main View", output)
-                
-                # Show debug depth mask with gradient
-                debug_mask = self.normalize_depth(depth_mirrored)
-                if person_blobs:
-                    # Draw detected contours on gradient
-                    for blob_data in person_blobs:
-                        # Extract contour from blob data
-                        if len(blob_data) == 5:
-                            _, _, _, contour, _ = blob_data
-                        else:
-                            _, _, _, contour = blob_data
-                        cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
-                cv2.imshow("🔍 Depth Map & Detection", debug_mask)
+                # Display output, with the debug depth mask beside it in debug
+                # mode - one window means one GUI blit per frame
+                if self.debug_mode:
+                    debug_mask = self.normalize_depth(depth_mirrored)
+                    if person_blobs:
+                        # Draw detected contours on gradient
+                        for blob_data in person_blobs:
+                            # Extract contour from blob data
+                            if len(blob_data) == 5:
+                                _, _, _, contour, _ = blob_data
+                            else:
+                                _, _, _, contour = blob_data
+                            cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
+                    display = np.hstack([output, cv2.cvtColor(debug_mask, cv2.COLOR_GRAY2BGR)])
+                else:
+                    display = output
+                cv2.imshow("🦇 Bat Particle Effect - Main View", display)
                 
                 # Handle key presses
                 key = cv2.waitKey(1) & 0xFF
@@ -1105,6 +1308,7 @@ Instructions:
             traceback.print_exc()
         finally:
             print("🧹 Cleaning up...")
+            self.stop_capture()
             cv2.destroyAllWindows()
             # Safe cleanup of freenect
             try:
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import freenect
+import cv2
 import sys
 
 def check_kinect():
@@ -13,7 +14,8 @@ def check_kinect():
         if depth is not None:
             print("✅ Depth data received!")
             print(f"   Shape: {depth.shape}")
-            print(f"   Range: {depth.min()} - {depth.max()}")
+            depth_min, depth_max, _, _ = cv2.minMaxLoc(depth)  # One pass for both
+            print(f"   Range: {int(depth_min)} - {int(depth_max)}")
         else:
             print("❌ No depth data")
             
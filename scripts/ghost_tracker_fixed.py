@@ -6,6 +6,8 @@ import numpy as np
 import time
 import random
 import os
+import math
+from operator import itemgetter
 
 class GhostTrackerFixed:
     def __init__(self):
@@ -16,9 +18,14 @@ class GhostTrackerFixed:
         self.ghost_alpha = 0.7
         self.ghost_color = (200, 200, 255)  # Light blue ghost
         
-        # Ghost sprites - load all ghost images
+        # normalize_depth lookup table and the (min, max) range it was built for
+        self._depth_lut = None
+        self._depth_lut_range = None
+        
+        # Ghost sprites - load all ghost images as (bgr, alpha) planes
         self.ghost_sprites = []
         self.load_ghost_sprites()
+        self._sprite_cache = {}  # (sprite id, height bucket) -> resized planes
         
         # Track ghost assignments for each person
         self.person_ghost_map = {}  # Maps person ID to ghost sprite
@@ -87,7 +94,7 @@ class GhostTrackerFixed:
                 sprite_path = os.path.join(sprite_folder, filename)
                 sprite = cv2.imread(sprite_path, cv2.IMREAD_UNCHANGED)
                 if sprite is not None:
-                    self.ghost_sprites.append(sprite)
+                    self.ghost_sprites.append(self.split_sprite(sprite))
                     print(f"Loaded ghost sprite: {filename}")
                 else:
                     print(f"Failed to load: {filename}")
@@ -97,6 +104,39 @@ class GhostTrackerFixed:
         else:
             print(f"Total ghosts loaded: {len(self.ghost_sprites)}")
 
+    def split_sprite(self, sprite):
+        """Split a sprite into its BGR image and a float32 0..1 alpha plane.
+        
+        Done once at load time so the per-frame blend doesn't have to
+        slice and rescale the alpha channel.
+        """
+        if sprite.shape[2] == 4:
+            return sprite[:, :, :3].copy(), sprite[:, :, 3].astype(np.float32) / 255
+        return sprite, np.ones(sprite.shape[:2], dtype=np.float32)
+
+    # Sprite heights are rounded to this many pixels so nearby bounding box
+    # sizes share one cached resize; at most SPRITE_CACHE_SIZE are kept
+    SPRITE_HEIGHT_STEP = 4
+    SPRITE_CACHE_SIZE = 64
+
+    def get_scaled_sprite(self, sprite, height):
+        """Return (bgr, alpha) resized to about height pixels tall, keeping the aspect ratio"""
+        step = self.SPRITE_HEIGHT_STEP
+        height = max(step, (height + step // 2) // step * step)
+        ghost_bgr, ghost_alpha = sprite
+        key = (id(ghost_bgr), height)
+        scaled = self._sprite_cache.get(key)
+        if scaled is None:
+            sprite_h, sprite_w = ghost_bgr.shape[:2]
+            width = max(1, int(height * sprite_w / sprite_h))
+            scaled = (cv2.resize(ghost_bgr, (width, height)),
+                      cv2.resize(ghost_alpha, (width, height)))
+            if len(self._sprite_cache) >= self.SPRITE_CACHE_SIZE:
+                # Drop the oldest entry
+                del self._sprite_cache[next(iter(self._sprite_cache))]
+            self._sprite_cache[key] = scaled
+        return scaled
+
     def get_depth_data(self):
         """Get depth data from Kinect"""
         try:
@@ -115,14 +155,20 @@ class GhostTrackerFixed:
 
     def normalize_depth(self, depth_mm):
         """Normalize depth to 0-255 gradient like kinect_viewer"""
-        d = depth_mm.copy().astype(np.float32)
-        d[d <= 0] = np.nan
-        near, far = float(self.depth_min), float(self.depth_max)
-        d = np.clip(d, near, far)
-        d = (d - near) / (far - near)  # 0..1
-        d = (1.0 - d) * 255.0          # invert so near = bright
-        d[np.isnan(d)] = 0
-        return d.astype(np.uint8)
+        # Depth is uint16, so map every possible value once per distance
+        # range and look the frame up in that table
+        depth_range = (self.depth_min, self.depth_max)
+        if self._depth_lut_range != depth_range:
+            d = np.arange(65536, dtype=np.float32)
+            d[d <= 0] = np.nan
+            near, far = float(self.depth_min), float(self.depth_max)
+            d = np.clip(d, near, far)
+            d = (d - near) / (far - near)  # 0..1
+            d = (1.0 - d) * 255.0          # invert so near = bright
+            d[np.isnan(d)] = 0
+            self._depth_lut = d.astype(np.uint8)
+            self._depth_lut_range = depth_range
+        return np.take(self._depth_lut, depth_mm)
 
     def find_all_person_blobs(self, depth):
         """Find all person-like blobs in the depth map using gradient"""
@@ -135,7 +181,8 @@ class GhostTrackerFixed:
         # Find contours on the mask (white areas = people)
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        person_blobs = []
+        # (area, blob) pairs, so the sort reuses the area from the size check
+        candidates = []
         for contour in contours:
             area = cv2.contourArea(contour)
             # Person-like size range
@@ -147,10 +194,11 @@ class GhostTrackerFixed:
                     
                     if 0 <= cy < depth.shape[0] and 0 <= cx < depth.shape[1]:
                         blob_depth = depth[cy, cx]
-                        person_blobs.append((cx, cy, blob_depth, contour))
+                        candidates.append((area, (cx, cy, blob_depth, contour)))
         
         # Sort by area (largest first)
-        person_blobs.sort(key=lambda x: cv2.contourArea(x[3]), reverse=True)
+        candidates.sort(key=itemgetter(0), reverse=True)
+        person_blobs = [blob for _, blob in candidates]
         
         return person_blobs
 
@@ -170,19 +218,25 @@ class GhostTrackerFixed:
                 print(f"Assigned ghost to person {person_id} with {cycle_time:.2f}s fade cycle")
         return self.person_ghost_map.get(person_id, None)
 
-    def get_current_opacity(self, person_id):
-        """Calculate current opacity for a person's ghost based on fade cycle"""
+    def get_current_opacity(self, person_id, now=None):
+        """Calculate current opacity for a person's ghost based on fade cycle.
+        
+        now is the frame's time.time(), so every ghost in a frame shares one
+        clock read; it is read here when not given.
+        """
         if person_id not in self.person_fade_data:
             return self.ghost_alpha
         
+        if now is None:
+            now = time.time()
         fade_data = self.person_fade_data[person_id]
-        elapsed = time.time() - fade_data['start_time']
+        elapsed = now - fade_data['start_time']
         
         # Calculate position in cycle (0 to 1)
         cycle_position = (elapsed % fade_data['cycle_time']) / fade_data['cycle_time']
         
         # Use sine wave for smooth fade in/out
-        sine_value = (np.sin(cycle_position * 2 * np.pi) + 1) / 2
+        sine_value = (math.sin(cycle_position * 2 * math.pi) + 1) / 2
         
         # Map to min/max opacity range
         opacity = fade_data['min_opacity'] + sine_value * (fade_data['max_opacity'] - fade_data['min_opacity'])
@@ -238,6 +292,9 @@ class GhostTrackerFixed:
             person_blobs = self.find_all_person_blobs(depth_mirrored)
             
             if person_blobs:
+                # One clock read drives every ghost's fade this frame
+                now = time.time()
+                
                 # Draw ghost sprite on each detected blob
                 for i, blob_data in enumerate(person_blobs):
                     cx, cy, blob_depth, contour = blob_data
@@ -252,18 +309,12 @@ class GhostTrackerFixed:
                     
                     if ghost_sprite is not None:
                         # Get current opacity for this person's fade cycle
-                        current_opacity = self.get_current_opacity(person_id)
+                        current_opacity = self.get_current_opacity(person_id, now)
                         
                         # Draw ghost sprite proportionally scaled to bounding box height
-                        sprite_h, sprite_w = ghost_sprite.shape[:2]
-                        aspect_ratio = sprite_w / sprite_h
-                        
-                        # Use bounding box height as sprite height
-                        ghost_height = h
-                        ghost_width = int(ghost_height * aspect_ratio)
-                        
-                        # Resize sprite maintaining aspect ratio
-                        ghost_resized = cv2.resize(ghost_sprite, (ghost_width, ghost_height))
+                        # Height matches bounding box, width maintains sprite's aspect ratio
+                        ghost_rgb, alpha = self.get_scaled_sprite(ghost_sprite, h)
+                        ghost_height, ghost_width = ghost_rgb.shape[:2]
                         
                         # Center sprite in bounding box
                         center_x = x + w // 2
@@ -279,20 +330,13 @@ class GhostTrackerFixed:
                         actual_w = x2 - x1
                         actual_h = y2 - y1
                         if actual_w != ghost_width or actual_h != ghost_height:
-                            ghost_resized = cv2.resize(ghost_resized, (actual_w, actual_h))
+                            ghost_rgb = cv2.resize(ghost_rgb, (actual_w, actual_h))
+                            alpha = cv2.resize(alpha, (actual_w, actual_h))
                         
                         # Blend sprite with background using current opacity
-                        if ghost_resized.shape[2] == 4:
-                            alpha = ghost_resized[:, :, 3] / 255.0
-                            ghost_rgb = ghost_resized[:, :, :3]
-                        else:
-                            alpha = np.ones((ghost_resized.shape[0], ghost_resized.shape[1]))
-                            ghost_rgb = ghost_resized
-                        
                         roi = output[y1:y2, x1:x2]
-                        for c in range(3):
-                            roi[:, :, c] = (1 - alpha * current_opacity) * roi[:, :, c] + \
-                                          (alpha * current_opacity) * ghost_rgb[:, :, c]
+                        a = alpha * np.float32(current_opacity)
+                        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
                     
                     # Draw person number and distance
                     distance_feet = blob_depth / 304.8
@@ -3,9 +3,10 @@ import cv2
 import numpy as np
 import time
 import math
+import threading
 
 class HandTrackingArt:
-    def __init__(self):
+    def __init__(self, use_opencl=False):
         # Default parameters - these will be adjustable via trackbars
         self.depth_min = 914      # mm - 3 feet
         self.depth_max = 5029     # mm - 16.5 feet
@@ -17,6 +18,31 @@ class HandTrackingArt:
         # Hand tracking settings
         self.hand_marker_size = 20
         self.hand_marker_color = (0, 0, 255)  # Red for "x" marks
+
+        # Reusable per-frame buffers (Kinect frames are always 640x480)
+        self._mask = np.empty((480, 640), np.uint8)
+        self._clip_buf = np.empty((480, 640), np.uint16)
+        self._vis_buf = np.empty((480, 640), np.uint8)
+        self._out = None  # Output frame, allocated on the first RGB frame
+
+        # Optionally compose the output frame through OpenCV's OpenCL (T-API)
+        # path. Off by default: at 640x480 the per-frame UMat upload costs
+        # more than it saves, and it skips the reused output buffer and the
+        # label cache. Detection always stays on the CPU.
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+
+        # Rasterized status labels, keyed by (text, scale, color, thickness)
+        self._label_cache = {}
+
+        # Background capture: the reader thread keeps the latest (depth, rgb)
+        # pair here so USB transfers overlap with frame processing
+        self._lock = threading.Lock()
+        self._latest = None
+        self._frame_seq = 0  # Bumped for every new pair from the reader
+        self._last_state = None  # (frame seq, settings) of the last drawn frame
+        self._first_frame = threading.Event()
+        self._capturing = False
+        self._reader_thread = None
         
         # Create control panel window
         self.setup_control_panel()
@@ -72,71 +98,144 @@ class HandTrackingArt:
         except:
             return None
 
+    def _reader(self):
+        """Capture thread: keep grabbing frames until capture is stopped"""
+        get_depth_data = self.get_depth_data
+        get_rgb_data = self.get_rgb_data
+        while self._capturing:
+            depth = get_depth_data()
+            rgb = get_rgb_data()
+            if depth is None or rgb is None:
+                time.sleep(0.1)
+                continue
+            with self._lock:
+                self._latest = (depth, rgb)
+                self._frame_seq += 1
+            self._first_frame.set()
+
+    def start_capture(self):
+        """Start the background capture thread"""
+        self._capturing = True
+        self._reader_thread = threading.Thread(target=self._reader, daemon=True)
+        self._reader_thread.start()
+
+    def stop_capture(self):
+        """Stop the background capture thread and wait for it to exit"""
+        self._capturing = False
+        if self._reader_thread is not None:
+            self._reader_thread.join(timeout=1.0)
+            self._reader_thread = None
+
     def find_hands(self, depth):
-        """Find hand-like objects in the depth image"""
-        # Create a mask for objects within our depth range
-        mask = (depth > self.depth_min) & (depth < self.depth_max)
-        mask = mask.astype(np.uint8) * 255
+        """Find hand-like objects in the depth image.
+
+        Returns a list of (cx, cy) hand centers. Blob areas and centroids
+        come from a single connected-components pass over the mask; the
+        labels are kept so find_hand_contours can outline the same blobs.
+        """
+        # Create a mask for objects within our depth range (written straight
+        # into the reusable buffer as 0/255, no boolean intermediates)
+        mask = cv2.inRange(depth, self.depth_min + 1, self.depth_max - 1, dst=self._mask)
 
-        # Find contours
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        # Label blobs and get area + centroid for all of them at once
+        _, self._labels, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
 
-        if not contours:
-            return [], mask
+        # Filter blobs by size (hands should be smaller than full body)
+        areas = stats[:, cv2.CC_STAT_AREA]
+        self._hand_keep = (areas > self.min_hand_area) & (areas < 50000)
+        self._hand_keep[0] = False  # Label 0 is the background
 
-        # Filter contours by size (hands should be smaller than full body)
-        hand_contours = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if self.min_hand_area < area < 50000:  # Hands are smaller than full body
-                hand_contours.append(contour)
+        hands = [(int(cx), int(cy)) for cx, cy in centroids[self._hand_keep]]
+        return hands, mask
 
-        return hand_contours, mask
+    def find_hand_contours(self):
+        """Outline the hands from the last find_hands call (only needed for display)"""
+        lut = np.zeros(len(self._hand_keep), np.uint8)
+        lut[self._hand_keep] = 255
+        hand_mask = lut[self._labels]
+        # The outlines are only drawn, so a coarser polygon approximation is fine
+        contours, _ = cv2.findContours(hand_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_TC89_KCOS)
+        return contours
 
-    def draw_hand_markers(self, image, hand_contours):
+    def draw_hand_markers(self, image, hands):
         """Draw red 'x' marks over detected hands"""
-        for contour in hand_contours:
-            # Get the center of the hand
-            M = cv2.moments(contour)
-            if M["m00"] > 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                
-                # Draw red "x" mark
-                size = self.hand_marker_size
-                cv2.line(image, (cx - size, cy - size), (cx + size, cy + size), self.hand_marker_color, 3)
-                cv2.line(image, (cx - size, cy + size), (cx + size, cy - size), self.hand_marker_color, 3)
-                
-                # Draw a small circle at the center
-                cv2.circle(image, (cx, cy), 5, self.hand_marker_color, -1)
+        for cx, cy in hands:
+            # Draw red "x" mark
+            size = self.hand_marker_size
+            cv2.line(image, (cx - size, cy - size), (cx + size, cy + size), self.hand_marker_color, 3)
+            cv2.line(image, (cx - size, cy + size), (cx + size, cy - size), self.hand_marker_color, 3)
+            
+            # Draw a small circle at the center
+            cv2.circle(image, (cx, cy), 5, self.hand_marker_color, -1)
 
-    def calculate_hand_distances(self, hand_contours, depth):
+    def calculate_hand_distances(self, hands, depth):
         """Calculate distances to each detected hand"""
-        distances = []
-        for contour in hand_contours:
-            M = cv2.moments(contour)
-            if M["m00"] > 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                
-                # Get depth at hand center
-                if 0 <= cy < depth.shape[0] and 0 <= cx < depth.shape[1]:
-                    hand_depth_mm = depth[cy, cx]
-                    distance_feet = hand_depth_mm / 304.8  # Convert mm to feet
-                    distances.append((cx, cy, distance_feet))
-        
-        return distances
+        if not hands:
+            return []
+
+        # Only the hand centers are read back from the 16-bit depth frame;
+        # connected-component centroids always lie inside the image
+        cx, cy = np.array(hands).T
+        distances_feet = depth[cy, cx] / 304.8  # Convert mm to feet
+        return [(x, y, d) for (x, y), d in zip(hands, distances_feet.tolist())]
 
     def create_depth_visualization(self, depth):
         """Create a depth visualization for debugging"""
-        # Normalize depth for display
-        depth_vis = depth.copy().astype(np.float32)
-        depth_vis[depth_vis <= 0] = np.nan
-        depth_vis = np.clip(depth_vis, self.depth_min, self.depth_max)
-        depth_vis = (depth_vis - self.depth_min) / (self.depth_max - self.depth_min)
-        depth_vis = (1.0 - depth_vis) * 255.0  # Invert so closer = brighter
-        depth_vis[np.isnan(depth_vis)] = 0
-        return depth_vis.astype(np.uint8)
+        # Normalize depth for display: clip into range, then one scaled
+        # conversion maps depth_min -> 255 and depth_max -> 0 (closer = brighter)
+        lo, hi = self.depth_min, self.depth_max
+        scale = 255.0 / max(hi - lo, 1)
+        np.clip(depth, lo, hi, out=self._clip_buf)
+        cv2.convertScaleAbs(self._clip_buf, dst=self._vis_buf, alpha=-scale, beta=hi * scale)
+        # No reading from the sensor shows as black
+        np.copyto(self._vis_buf, 0, where=depth == 0)
+        return self._vis_buf
+
+    def draw_label(self, image, text, org, scale, color, thickness):
+        """cv2.putText for labels that repeat from frame to frame.
+
+        The label's glyph coverage is rasterized once into a small patch and
+        blended into the frame with cv2.blendLinear, so steady labels like
+        the hand count and range line skip glyph rendering on later frames.
+        """
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        key = (text, scale, color, thickness)
+        entry = self._label_cache.get(key)
+        if entry is None:
+            (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+            top = h + thickness
+            coverage = np.zeros((top + baseline + thickness, w + 2 * thickness), np.uint8)
+            cv2.putText(coverage, text, (thickness, top), font, scale, 255, thickness)
+            weight = coverage.astype(np.float32) / 255.0
+            fill = np.empty(coverage.shape + (3,), np.uint8)
+            fill[:] = color
+            if len(self._label_cache) >= 64:
+                self._label_cache.clear()
+            entry = (fill, weight, 1.0 - weight, top, thickness)
+            self._label_cache[key] = entry
+
+        fill, weight, inv_weight, top, left = entry
+        x, y = org[0] - left, org[1] - top
+        ph, pw = weight.shape
+        if (not isinstance(image, np.ndarray) or x < 0 or y < 0
+                or y + ph > image.shape[0] or x + pw > image.shape[1]):
+            # UMat output or a label running off the edge: draw it directly
+            cv2.putText(image, text, org, font, scale, color, thickness)
+            return
+        roi = image[y:y + ph, x:x + pw]
+        roi[:] = cv2.blendLinear(fill, roi, weight, inv_weight)
+
+    def handle_key(self, output):
+        """Handle key presses; returns False when the user asks to quit"""
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            return False
+        elif key == ord('s'):
+            # Save a frame
+            timestamp = int(time.time() * 1000)
+            cv2.imwrite(f"hand_tracking_{timestamp}.png", output)
+            print(f"Saved hand_tracking_{timestamp}.png")
+        return True
 
     def run(self):
         """Main loop for the hand tracking art installation"""
@@ -144,78 +243,105 @@ class HandTrackingArt:
         print("Use the Control Panel to adjust settings in real-time!")
         print("Press 'q' to quit, 's' to save a frame")
 
+        self.start_capture()
+        while not self._first_frame.wait(0.1):
+            print("Waiting for Kinect...")
+
+        # Bind the functions and constants used every frame as locals
+        put_text = cv2.putText
+        draw_label = self.draw_label
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        convert_scale = cv2.convertScaleAbs
+        draw_contours = cv2.drawContours
+        imshow = cv2.imshow
+        UMat = cv2.UMat
+        lock = self._lock
+        find_hands = self.find_hands
+        draw_hand_markers = self.draw_hand_markers
+        calculate_hand_distances = self.calculate_hand_distances
+        handle_key = self.handle_key
+
         while True:
-            # Get depth and RGB data
-            depth = self.get_depth_data()
-            rgb = self.get_rgb_data()
+            # Get the latest depth and RGB data from the capture thread
+            with lock:
+                depth, rgb = self._latest
+                frame_seq = self._frame_seq
 
-            if depth is None or rgb is None:
-                print("Waiting for Kinect...")
-                time.sleep(0.1)
+            # Nothing to redraw if neither the frame nor the settings changed
+            # (the loop can spin faster than the Kinect's 30 Hz)
+            state = (frame_seq, self.depth_min, self.depth_max, self.min_hand_area,
+                     self.video_opacity, self.hand_marker_size,
+                     self.show_depth_vis, self.show_contours)
+            if state == self._last_state:
+                if not handle_key(output):
+                    break
                 continue
+            self._last_state = state
 
             # Create output image with video opacity
-            if self.video_opacity > 0:
-                output = rgb.copy()
-                # Apply video opacity by blending with black
-                output = cv2.addWeighted(output, self.video_opacity,
-                                       np.zeros_like(output), 1 - self.video_opacity, 0)
+            if self.video_opacity > 0 and self.use_opencl:
+                # Upload once; the scale, drawing and imshow all accept UMat
+                output = convert_scale(UMat(rgb), alpha=self.video_opacity)
             else:
-                # No video feed, just black background
-                output = np.zeros_like(rgb)
+                if self._out is None or self._out.shape != rgb.shape:
+                    self._out = np.empty_like(rgb)
+                output = self._out
+                if self.video_opacity > 0:
+                    # Apply video opacity (blending with black is just a scale)
+                    convert_scale(rgb, dst=output, alpha=self.video_opacity)
+                else:
+                    # No video feed, just black background (the overlays drew
+                    # on last frame's buffer, so it always needs clearing)
+                    output.fill(0)
 
             # Find hands and draw markers
-            hand_contours, mask = self.find_hands(depth)
-            if hand_contours:
+            hands, mask = find_hands(depth)
+            if hands:
                 # Draw red "x" marks over hands
-                self.draw_hand_markers(output, hand_contours)
+                draw_hand_markers(output, hands)
                 
                 # Calculate and display distances
-                distances = self.calculate_hand_distances(hand_contours, depth)
+                distances = calculate_hand_distances(hands, depth)
                 
                 # Display hand count and distances
-                cv2.putText(output, f"Hands Detected: {len(hand_contours)}",
-                          (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                draw_label(output, f"Hands Detected: {len(hands)}",
+                           (10, 30), 0.7, (0, 255, 0), 2)
                 
                 # Display individual hand distances
                 for i, (cx, cy, distance_feet) in enumerate(distances):
-                    cv2.putText(output, f"Hand {i+1}: {distance_feet:.4f} ft",
-                              (10, 60 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                    put_text(output, f"Hand {i+1}: {distance_feet:.4f} ft",
+                              (10, 60 + i * 30), font, 0.5, (255, 255, 255), 1)
                 
                 # Convert range to feet with 4 decimal places
                 min_feet = self.depth_min / 304.8
                 max_feet = self.depth_max / 304.8
-                cv2.putText(output, f"Range: {min_feet:.4f} - {max_feet:.4f} feet",
-                          (10, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                draw_label(output, f"Range: {min_feet:.4f} - {max_feet:.4f} feet",
+                           (10, 200), 0.5, (255, 255, 255), 1)
             else:
-                cv2.putText(output, "No hands detected - adjust distance range",
-                          (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                draw_label(output, "No hands detected - adjust distance range",
+                           (10, 30), 0.7, (0, 0, 255), 2)
 
             # Show contours if enabled
-            if self.show_contours and hand_contours:
-                cv2.drawContours(output, hand_contours, -1, (255, 0, 0), 2)
+            if self.show_contours and hands:
+                draw_contours(output, self.find_hand_contours(), -1, (255, 0, 0), 2)
 
             # Display the output
-            cv2.imshow("Hand Tracking Art Installation", output)
+            imshow("Hand Tracking Art Installation", output)
 
             # Show depth visualization if enabled
             if self.show_depth_vis:
                 depth_vis = self.create_depth_visualization(depth)
-                cv2.imshow("Depth Visualization", depth_vis)
+                imshow("Depth Visualization", depth_vis)
 
             # Handle key presses
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            if not handle_key(output):
                 break
-            elif key == ord('s'):
-                # Save a frame
-                timestamp = int(time.time() * 1000)
-                cv2.imwrite(f"hand_tracking_{timestamp}.png", output)
-                print(f"Saved hand_tracking_{timestamp}.png")
 
+        self.stop_capture()
         cv2.destroyAllWindows()
 
 if __name__ == "__main__":
+    art = None
     try:
         art = HandTrackingArt()
         art.run()
@@ -224,4 +350,6 @@ if __name__ == "__main__":
         import traceback
         traceback.print_exc()
     finally:
+        if art is not None:
+            art.stop_capture()
         freenect.sync_stop()
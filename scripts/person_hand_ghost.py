@@ -4,6 +4,7 @@ import numpy as np
 import time
 import mediapipe as mp
 import math
+import threading
 
 class PersonHandGhost:
     def __init__(self):
@@ -16,18 +17,30 @@ class PersonHandGhost:
         
         # MediaPipe setup
         self.mp_hands = mp.solutions.hands
-        self.mp_pose = mp.solutions.pose
         self.hands = self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=2,
+            model_complexity=0,  # Lite model - only the wrist landmark is used
             min_detection_confidence=0.7,
             min_tracking_confidence=0.5
         )
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+        
+        # Performance optimization: only run hand inference every few frames
+        # and reuse the last landmarks in between
+        self.hand_frame_skip = 2
+        self.hand_frame_counter = 0
+        self.last_hand_landmarks = None
+        # Frames are shrunk to this size for MediaPipe - landmarks come back
+        # normalized, so they still map onto the full-size frame
+        self.hand_input_size = (320, 240)
+        
+        # Background capture thread; latest_frames holds the newest
+        # (depth, rgb) pair and frame_seq counts how many have arrived
+        self.capture_thread = None
+        self.capture_running = False
+        self.latest_frames = (None, None)
+        self.frame_seq = 0
+        self._frame_cond = threading.Condition()
         
         # Ghost sprite
         self.ghost_sprite = None
@@ -85,11 +98,48 @@ class PersonHandGhost:
         except:
             return None
 
+    def start_capture(self):
+        """Start reading Kinect frames on a background thread"""
+        self.capture_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+
+    def stop_capture(self):
+        """Stop the capture thread and wait for it to exit"""
+        self.capture_running = False
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=1.0)
+            self.capture_thread = None
+
+    def _capture_loop(self):
+        """Fetch depth + RGB pairs so USB transfers overlap hand tracking"""
+        while self.capture_running:
+            depth = self.get_depth_data()
+            rgb = self.get_rgb_data()
+            if depth is None or rgb is None:
+                time.sleep(0.1)
+                continue
+            with self._frame_cond:
+                self.latest_frames = (depth, rgb)
+                self.frame_seq += 1
+                self._frame_cond.notify_all()
+
+    def wait_for_frames(self, last_seq, timeout=0.1):
+        """Return (depth, rgb, seq) once a pair newer than last_seq arrives.
+        
+        Returns (None, None, last_seq) if nothing new shows up in time.
+        """
+        with self._frame_cond:
+            if not self._frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout):
+                return None, None, last_seq
+            depth, rgb = self.latest_frames
+            return depth, rgb, self.frame_seq
+
     def find_person_in_depth(self, depth):
         """Find the largest person-like object in depth range"""
-        # Create mask for objects within depth range
-        mask = (depth > self.depth_min) & (depth < self.depth_max)
-        mask = mask.astype(np.uint8) * 255
+        # Create mask for objects within depth range (inRange bounds are
+        # inclusive, so shift them in by one to keep the strict comparison)
+        mask = cv2.inRange(depth, self.depth_min + 1, self.depth_max - 1)
         
         # Find contours
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
@@ -107,16 +157,23 @@ class PersonHandGhost:
 
     def get_hand_centers_3d(self, rgb, depth, person_contour):
         """Get 3D positions of hand centers using MediaPipe + depth"""
-        # Convert BGR to RGB for MediaPipe
-        rgb_mp = cv2.cvtColor(rgb, cv2.COLOR_BGR2RGB)
-        
-        # Process with MediaPipe
-        results = self.hands.process(rgb_mp)
+        # Run MediaPipe every hand_frame_skip frames, or every frame while no
+        # hands are found; otherwise reuse the last landmarks
+        self.hand_frame_counter += 1
+        if not self.last_hand_landmarks or self.hand_frame_counter % self.hand_frame_skip == 0:
+            # Downscale and convert BGR to RGB for MediaPipe
+            small = cv2.resize(rgb, self.hand_input_size, interpolation=cv2.INTER_AREA)
+            rgb_mp = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+            rgb_mp.flags.writeable = False  # Lets MediaPipe skip its own copy
+            
+            # Process with MediaPipe
+            results = self.hands.process(rgb_mp)
+            self.last_hand_landmarks = results.multi_hand_landmarks
         
         hand_centers_3d = []
         
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
+        if self.last_hand_landmarks:
+            for hand_landmarks in self.last_hand_landmarks:
                 # Get hand center (wrist landmark)
                 wrist = hand_landmarks.landmark[0]  # Wrist is landmark 0
                 
@@ -156,7 +213,7 @@ class PersonHandGhost:
         center_depth = (hand1[2] + hand2[2]) // 2
         
         # Calculate distance between hands
-        distance = math.sqrt((hand1[0] - hand2[0])**2 + (hand1[1] - hand2[1])**2)
+        distance = math.hypot(hand1[0] - hand2[0], hand1[1] - hand2[1])
         
         return (center_x, center_y, center_depth), distance
 
@@ -195,11 +252,10 @@ class PersonHandGhost:
             alpha = np.ones((ghost_resized.shape[0], ghost_resized.shape[1]))
             ghost_rgb = ghost_resized
         
-        # Blend ghost with background
+        # Blend ghost with background in one pass over the ROI
         roi = image[y1:y2, x1:x2]
-        for c in range(3):
-            roi[:, :, c] = (1 - alpha * self.ghost_alpha) * roi[:, :, c] + \
-                          (alpha * self.ghost_alpha) * ghost_rgb[:, :, c]
+        a = (alpha * self.ghost_alpha).astype(np.float32)
+        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
         
         return image
 
@@ -221,68 +277,71 @@ class PersonHandGhost:
         print("Use the Control Panel to adjust settings!")
         print("Press 'q' to quit, 's' to save a frame")
         
-        while True:
-            # Get data from Kinect
-            depth = self.get_depth_data()
-            rgb = self.get_rgb_data()
-            
-            if depth is None or rgb is None:
-                print("Waiting for Kinect...")
-                time.sleep(0.1)
-                continue
-            
-            # Create output with video opacity
-            if self.video_opacity > 0:
-                output = rgb.copy()
-                output = cv2.addWeighted(output, self.video_opacity,
-                                       np.zeros_like(output), 1 - self.video_opacity, 0)
-            else:
-                output = np.zeros_like(rgb)
-            
-            # Find person in depth
-            person_contour, mask = self.find_person_in_depth(depth)
-            
-            if person_contour is not None:
-                # Get hand centers using MediaPipe + depth
-                hand_centers_3d = self.get_hand_centers_3d(rgb, depth, person_contour)
+        self.start_capture()
+        seq = 0
+        try:
+            while True:
+                # Get the newest frames from the capture thread
+                depth, rgb, seq = self.wait_for_frames(seq)
+                
+                if depth is None or rgb is None:
+                    print("Waiting for Kinect...")
+                    continue
                 
-                if len(hand_centers_3d) >= 2:
-                    # Calculate ghost position between hands
-                    ghost_position, hand_distance = self.calculate_ghost_position(hand_centers_3d)
+                # Create output with video opacity
+                if self.video_opacity > 0:
+                    output = rgb.copy()
+                    output = cv2.addWeighted(output, self.video_opacity,
+                                           np.zeros_like(output), 1 - self.video_opacity, 0)
+                else:
+                    output = np.zeros_like(rgb)
+                
+                # Find person in depth
+                person_contour, mask = self.find_person_in_depth(depth)
+                
+                if person_contour is not None:
+                    # Get hand centers using MediaPipe + depth
+                    hand_centers_3d = self.get_hand_centers_3d(rgb, depth, person_contour)
                     
-                    if ghost_position is not None:
-                        # Draw ghost at calculated position
-                        output = self.draw_ghost_at_position(output, ghost_position, hand_distance)
-                        
-                        # Draw hand markers
-                        self.draw_hand_markers(output, hand_centers_3d)
+                    if len(hand_centers_3d) >= 2:
+                        # Calculate ghost position between hands
+                        ghost_position, hand_distance = self.calculate_ghost_position(hand_centers_3d)
                         
-                        # Display status
-                        cv2.putText(output, f"Person + 2 Hands Detected!", 
-                                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                        cv2.putText(output, f"Hand Distance: {hand_distance:.1f}px", 
-                                   (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                        if ghost_position is not None:
+                            # Draw ghost at calculated position
+                            output = self.draw_ghost_at_position(output, ghost_position, hand_distance)
+                            
+                            # Draw hand markers
+                            self.draw_hand_markers(output, hand_centers_3d)
+                            
+                            # Display status
+                            cv2.putText(output, f"Person + 2 Hands Detected!", 
+                                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                            cv2.putText(output, f"Hand Distance: {hand_distance:.1f}px", 
+                                       (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                        else:
+                            cv2.putText(output, "Person detected, need 2 hands", 
+                                       (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
                     else:
-                        cv2.putText(output, "Person detected, need 2 hands", 
-                                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                        cv2.putText(output, f"Person detected, {len(hand_centers_3d)} hands found", 
+                                   (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
                 else:
-                    cv2.putText(output, f"Person detected, {len(hand_centers_3d)} hands found", 
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            else:
-                cv2.putText(output, "No person detected - adjust distance range", 
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-            
-            # Display output
-            cv2.imshow("Person Hand Ghost Tracking", output)
-            
-            # Handle key presses
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                break
-            elif key == ord('s'):
-                timestamp = int(time.time() * 1000)
-                cv2.imwrite(f"person_hand_ghost_{timestamp}.png", output)
-                print(f"Saved person_hand_ghost_{timestamp}.png")
+                    cv2.putText(output, "No person detected - adjust distance range", 
+                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                
+                # Display output
+                cv2.imshow("Person Hand Ghost Tracking", output)
+                
+                # Handle key presses
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord('s'):
+                    timestamp = int(time.time() * 1000)
+                    cv2.imwrite(f"person_hand_ghost_{timestamp}.png", output)
+                    print(f"Saved person_hand_ghost_{timestamp}.png")
+        finally:
+            self.stop_capture()
         
         cv2.destroyAllWindows()
 
@@ -15,7 +15,8 @@ def test_kinect():
         if depth is not None:
             print("✅ Depth data received!")
             print(f"   Depth shape: {depth.shape}")
-            print(f"   Depth range: {depth.min()} - {depth.max()}")
+            depth_min, depth_max, _, _ = cv2.minMaxLoc(depth)  # One pass for both
+            print(f"   Depth range: {int(depth_min)} - {int(depth_max)}")
         else:
             print("❌ No depth data")
             
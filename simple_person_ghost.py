@@ -27,6 +27,7 @@ class SimplePersonGhost:
         # Ghost sprites - load all ghost images
         self.ghost_sprites = []
         self.load_ghost_sprites()
+        self._sprite_cache = {}  # (sprite id, height bucket) -> resized sprite
         
         # Track ghost assignments for each person
         self.person_ghost_map = {}  # Maps person ID to ghost sprite
@@ -192,6 +193,12 @@ class SimplePersonGhost:
             elif 50 <= x <= 80 and 200 <= y <= 230:
                 self.debug_mode = not self.debug_mode
                 print(f"🔧 Debug mode {'enabled' if self.debug_mode else 'disabled'}")
+                if not self.debug_mode:
+                    # The depth view is only updated in debug mode, so close it
+                    try:
+                        cv2.destroyWindow("🔍 Depth Map & Detection")
+                    except cv2.error:
+                        pass
                 # Redraw the control panel to update checkbox state
                 self.create_static_control_panel()
             
@@ -438,6 +445,27 @@ Instructions:
         d[np.isnan(d)] = 0
         return d.astype(np.uint8)
     
+    # Sprite heights are rounded to this many pixels so nearby bounding box
+    # sizes share one cached resize; at most SPRITE_CACHE_SIZE are kept
+    SPRITE_HEIGHT_STEP = 4
+    SPRITE_CACHE_SIZE = 64
+    
+    def get_scaled_sprite(self, sprite, height):
+        """Return sprite resized to about height pixels tall, keeping its aspect ratio"""
+        step = self.SPRITE_HEIGHT_STEP
+        height = max(step, (height + step // 2) // step * step)
+        key = (id(sprite), height)
+        scaled = self._sprite_cache.get(key)
+        if scaled is None:
+            sprite_h, sprite_w = sprite.shape[:2]
+            width = max(1, int(height * sprite_w / sprite_h))
+            scaled = cv2.resize(sprite, (width, height))
+            if len(self._sprite_cache) >= self.SPRITE_CACHE_SIZE:
+                # Drop the oldest entry
+                del self._sprite_cache[next(iter(self._sprite_cache))]
+            self._sprite_cache[key] = scaled
+        return scaled
+    
     def assign_ghost_to_person(self, person_id):
         """Assign a random ghost to a person if they don't have one yet"""
         if person_id not in self.person_ghost_map:
@@ -638,11 +666,10 @@ Instructions:
             alpha = np.ones((ghost_resized.shape[0], ghost_resized.shape[1]))
             ghost_rgb = ghost_resized
         
-        # Blend ghost with background
+        # Blend ghost with background in one OpenCV pass over all channels
         roi = image[y1:y2, x1:x2]
-        for c in range(3):
-            roi[:, :, c] = (1 - alpha * self.ghost_alpha) * roi[:, :, c] + \
-                          (alpha * self.ghost_alpha) * ghost_rgb[:, :, c]
+        a = (alpha * self.ghost_alpha).astype(np.float32)
+        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
         
         return image
 
@@ -697,9 +724,10 @@ Instructions:
                     cv2.putText(test_output, "Make sure Kinect is plugged in and powered", (50, 280), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                     cv2.imshow("👻 Ghost Tracking - Main View", test_output)
-                cv2.imshow("🔍 Depth Map & Detection", test_output)
-                time.sleep(0.1)
-                continue
+                    if self.debug_mode:
+                        cv2.imshow("🔍 Depth Map & Detection", test_output)
+                    time.sleep(0.1)
+                    continue
             
             except Exception as e:
                 consecutive_failures += 1
@@ -790,15 +818,8 @@ Instructions:
                         
                         # Draw ghost sprite proportionally scaled to bounding box height
                         # Height matches bounding box, width maintains sprite's aspect ratio
-                        sprite_h, sprite_w = ghost_sprite.shape[:2]
-                        aspect_ratio = sprite_w / sprite_h
-                        
-                        # Use bounding box height as sprite height
-                        ghost_height = h
-                        ghost_width = int(ghost_height * aspect_ratio)
-                        
-                        # Resize sprite maintaining aspect ratio
-                        ghost_resized = cv2.resize(ghost_sprite, (ghost_width, ghost_height))
+                        ghost_resized = self.get_scaled_sprite(ghost_sprite, h)
+                        ghost_height, ghost_width = ghost_resized.shape[:2]
                         
                         # Center sprite in bounding box
                         center_x = x + w // 2
@@ -825,9 +846,8 @@ Instructions:
                             ghost_rgb = ghost_resized
                         
                         roi = output[y1:y2, x1:x2]
-                        for c in range(3):
-                            roi[:, :, c] = (1 - alpha * current_opacity) * roi[:, :, c] + \
-                                          (alpha * current_opacity) * ghost_rgb[:, :, c]
+                        a = (alpha * current_opacity).astype(np.float32)
+                        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
                     
                     # Draw person number and distance (debug mode only)
                     if self.debug_mode:
@@ -860,18 +880,19 @@ Instructions:
             # Display output
             cv2.imshow("👻 Ghost Tracking - Main View", output)
             
-            # Show debug depth mask with gradient
-            debug_mask = self.normalize_depth(depth_mirrored)
-            if person_blobs:
-                # Draw detected contours on gradient
-                for blob_data in person_blobs:
-                    # Extract contour from blob data
-                    if len(blob_data) == 5:
-                        _, _, _, contour, _ = blob_data
-                    else:
-                        _, _, _, contour = blob_data
-                    cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
-            cv2.imshow("🔍 Depth Map & Detection", debug_mask)
+            # Show debug depth mask with gradient (debug mode only)
+            if self.debug_mode:
+                debug_mask = self.normalize_depth(depth_mirrored)
+                if person_blobs:
+                    # Draw detected contours on gradient
+                    for blob_data in person_blobs:
+                        # Extract contour from blob data
+                        if len(blob_data) == 5:
+                            _, _, _, contour, _ = blob_data
+                        else:
+                            _, _, _, contour = blob_data
+                        cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
+                cv2.imshow("🔍 Depth Map & Detection", debug_mask)
             
             # Handle key presses
             key = cv2.waitKey(1) & 0xFF
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import functools
 import os
 import time
 import cv2
@@ -13,6 +14,9 @@ except ImportError as e:
 CAPTURE_DIR = os.path.join(os.path.dirname(__file__), "..", "captures")
 os.makedirs(CAPTURE_DIR, exist_ok=True)
 
+# BGR frame reused by get_rgb() (640x480 VIDEO_RGB)
+_bgr = np.empty((480, 640, 3), dtype=np.uint8)
+
 def get_depth():
     depth, _ = freenect.sync_get_depth(format=freenect.DEPTH_MM)  # millimeters
     if depth is None:
@@ -24,18 +28,23 @@ def get_rgb():
     rgb, _ = freenect.sync_get_video(format=freenect.VIDEO_RGB)
     if rgb is None:
         return None
-    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR, dst=_bgr)
 
-def normalize_depth_for_display(depth_mm):
-    # Clip range for display (e.g., 500mm..4500mm), then normalize to 0..255
-    d = depth_mm.copy().astype(np.float32)
-    d[d <= 0] = np.nan
-    near, far = 500.0, 4500.0
+@functools.lru_cache(maxsize=4)
+def depth_display_lut(near=500.0, far=4500.0):
+    # Every uint16 depth maps to a fixed display value, so do the float math
+    # once per (near, far) range for all 65536 inputs
+    d = np.arange(65536, dtype=np.float32)
     d = np.clip(d, near, far)
     d = (d - near) / (far - near)  # 0..1
     d = (1.0 - d) * 255.0          # invert so near = bright
-    d[np.isnan(d)] = 0
-    return d.astype(np.uint8)
+    lut = d.astype(np.uint8)
+    lut[0] = 0                     # no reading
+    return lut
+
+def normalize_depth_for_display(depth_mm, near=500.0, far=4500.0):
+    # Clip range for display (e.g., 500mm..4500mm), then normalize to 0..255
+    return np.take(depth_display_lut(near, far), depth_mm)
 
 def save_pair(bgr, depth_mm):
     ts = int(time.time() * 1000)
@@ -11,11 +11,44 @@ from PIL import Image, ImageTk
 import threading
 import subprocess
 
+class BlobSet:
+    """Person blobs found in one frame, stored as parallel arrays.
+    
+    Row i of xy/depth/area/ids describes contours[i]. ids stays zero until
+    track_people assigns them.
+    """
+    
+    def __init__(self, xy, depth, area, contours):
+        self.xy = xy              # (N, 2) int32 centers
+        self.depth = depth        # (N,) uint16 depth at each center
+        self.area = area          # (N,) float32 contour areas
+        self.contours = contours  # list of N OpenCV contours
+        self.ids = np.zeros(len(contours), dtype=np.int32)
+    
+    def __len__(self):
+        return len(self.contours)
+    
+    def take(self, order):
+        """Return a BlobSet with the rows reordered/selected by order"""
+        blobs = BlobSet(self.xy[order], self.depth[order], self.area[order],
+                        [self.contours[i] for i in order])
+        blobs.ids = self.ids[order]
+        return blobs
+
 class VideoGhostingEffect:
+    # The ghost trail ring packs one slot per bit of a uint8 image, so
+    # ghost_trail_length is capped at this many frames
+    TRAIL_SLOTS = 8
+    
+    # Person contours are found on depth downsampled by this factor, then
+    # scaled back up to full-frame coordinates
+    CONTOUR_SCALE = 2
+    
     def __init__(self):
         # Default parameters - User's preferred settings
         self.depth_min = 217      # mm = 0.7120 feet
         self.depth_max = 3626     # mm = 11.8943 feet
+        self.update_depth_span()
         self.video_opacity = 0
         self.ghost_alpha = 0.7
         self.ghost_color = (200, 200, 255)  # Light blue ghost
@@ -25,25 +58,47 @@ class VideoGhostingEffect:
         self.motor_tilt = 0  # -30 to +30 degrees
         
         # Video ghosting effect settings (optimized for performance)
-        self.ghost_trail_length = 5  # Reduced from 10 to 5 for better performance
-        self.ghost_trails = []  # List to store previous silhouettes
+        self.ghost_trail_length = 5  # Reduced from 10 to 5 for better performance (max TRAIL_SLOTS)
+        # Trail ring buffer packed into one image: bit k of a pixel is set when
+        # the silhouette stored in slot k covers it
+        self._trail_bits = None
+        self._trail_len = 0  # Slots in use, rebuilt when ghost_trail_length changes
+        self._trail_idx = 0  # Next slot to overwrite
+        self._trail_count = 0
+        self._trail_luts = None  # (key, keep LUT, alpha LUT) for the current ring order
+        self._trail_weights = None  # (keep, alpha) images, reset when the ring changes
         self.silhouette_alpha = 0.4  # Increased alpha since we have fewer layers
         self.silhouette_color = (255, 255, 255)  # White silhouettes
+        self._color_plate = None  # Frame filled with silhouette_color, built on first use
+        self._ghost_cache = {}  # (sprite id, ghost size) -> resized ghost sprite
         
         # Performance optimization settings
         self.frame_skip = 2  # Process every 2nd frame for silhouette detection
         self.frame_counter = 0
         self.last_silhouette = None
+        # Per-frame scratch images, reused once the frame size is known
+        self._silhouette_buf = None
+        self._output_buf = None
         
         # Background capture
         self.background_image = None
         self.capture_background = False
         self.debug_mode = False  # Default to off
         
+        # Background capture thread; latest_frames holds the newest
+        # (depth, rgb) pair and frame_seq counts how many have arrived
+        self.capture_thread = None
+        self.capture_running = False
+        self.latest_frames = (None, None)
+        self.frame_seq = 0
+        self._frame_cond = threading.Condition()
+        
         # Time exposure settings (3-second capture with noise reduction)
         self.time_exposure_duration = 10.0  # 3 seconds
         self.time_exposure_start_time = None
-        self.time_exposure_frames_list = []
+        # Running float32 sum of the captured frames and how many were added
+        self.time_exposure_sum = None
+        self.time_exposure_count = 0
         
         # Initialize Kinect
         self.initialize_kinect()
@@ -107,12 +162,14 @@ class VideoGhostingEffect:
         """Update min distance from trackbar"""
         feet = val / 10000.0
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Min distance set to {feet:.4f} feet ({self.depth_min}mm)")
 
     def update_max_distance_feet(self, val):
         """Update max distance from trackbar"""
         feet = val / 10000.0
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Max distance set to {feet:.4f} feet ({self.depth_max}mm)")
 
     def update_video_opacity(self, val):
@@ -120,38 +177,26 @@ class VideoGhostingEffect:
         self.video_opacity = val / 100.0
         print(f"Video opacity set to {self.video_opacity:.2f}")
     
-    def average_frames(self, frames_list):
-        """Average multiple frames to create a higher quality background image"""
-        if not frames_list:
+    def average_frames(self, frame_sum, frame_count):
+        """Average accumulated frames to create a higher quality background image"""
+        if frame_sum is None or frame_count == 0:
             return None
         
-        # Convert frames to float for averaging
-        float_frames = [frame.astype(np.float32) for frame in frames_list]
-        
-        # Calculate the average
-        averaged = np.mean(float_frames, axis=0)
-        
-        # Convert back to uint8
-        result = np.clip(averaged, 0, 255).astype(np.uint8)
+        # Divide the running sum and convert back to uint8
+        result = np.clip(frame_sum / frame_count, 0, 255).astype(np.uint8)
         
-        print(f"⏱️ Averaged {len(frames_list)} frames for improved quality")
+        print(f"⏱️ Averaged {frame_count} frames for improved quality")
         return result
     
-    def average_frames_with_noise_reduction(self, frames_list):
-        """Average multiple frames with noise reduction for high-quality background"""
-        if not frames_list:
+    def average_frames_with_noise_reduction(self, frame_sum, frame_count):
+        """Average accumulated frames with noise reduction for high-quality background"""
+        if frame_sum is None or frame_count == 0:
             return None
         
-        print(f"⏱️ Processing {len(frames_list)} frames with noise reduction...")
+        print(f"⏱️ Processing {frame_count} frames with noise reduction...")
         
-        # Convert frames to float for processing
-        float_frames = [frame.astype(np.float32) for frame in frames_list]
-        
-        # Calculate the average
-        averaged = np.mean(float_frames, axis=0)
-        
-        # Convert back to uint8 for OpenCV processing
-        averaged_uint8 = np.clip(averaged, 0, 255).astype(np.uint8)
+        # Divide the running sum and convert back to uint8 for OpenCV processing
+        averaged_uint8 = np.clip(frame_sum / frame_count, 0, 255).astype(np.uint8)
         
         # Apply noise reduction using bilateral filter
         # This preserves edges while reducing noise
@@ -160,7 +205,7 @@ class VideoGhostingEffect:
         # Additional Gaussian blur for extra smoothness (optional)
         # noise_reduced = cv2.GaussianBlur(noise_reduced, (3, 3), 0)
         
-        print(f"⏱️ Applied noise reduction to {len(frames_list)} frames")
+        print(f"⏱️ Applied noise reduction to {frame_count} frames")
         return noise_reduced
 
 
@@ -180,6 +225,12 @@ class VideoGhostingEffect:
             elif 50 <= x <= 80 and 200 <= y <= 230:
                 self.debug_mode = not self.debug_mode
                 print(f"🔧 Debug mode {'enabled' if self.debug_mode else 'disabled'}")
+                if not self.debug_mode:
+                    # The depth view is only updated in debug mode, so close it
+                    try:
+                        cv2.destroyWindow("🔍 Depth Map & Detection")
+                    except cv2.error:
+                        pass
                 # Redraw the control panel to update checkbox state
                 self.create_static_control_panel()
             
@@ -232,12 +283,14 @@ class VideoGhostingEffect:
         """Update min distance from UI slider"""
         feet = float(val)
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         self.min_dist_label.config(text=f"{feet:.4f} ft")
         
     def update_max_distance_ui(self, val):
         """Update max distance from UI slider"""
         feet = float(val)
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         self.max_dist_label.config(text=f"{feet:.4f} ft")
         
     def update_video_opacity_ui(self, val):
@@ -298,12 +351,14 @@ Instructions:
         # Convert from feet*10000 back to mm
         feet = val / 10000.0
         self.depth_min = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Min distance set to {feet:.4f} feet ({self.depth_min}mm)")
 
     def update_max_distance_feet(self, val):
         # Convert from feet*10000 back to mm
         feet = val / 10000.0
         self.depth_max = int(feet * 304.8)
+        self.update_depth_span()
         print(f"Max distance set to {feet:.4f} feet ({self.depth_max}mm)")
 
     def update_video_opacity(self, val):
@@ -367,6 +422,43 @@ Instructions:
             # Don't print every error to avoid spam
             return None
 
+    def start_capture(self):
+        """Start reading Kinect frames on a background thread"""
+        self.capture_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+    
+    def stop_capture(self):
+        """Stop the capture thread and wait for it to exit"""
+        self.capture_running = False
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=1.0)
+            self.capture_thread = None
+    
+    def _capture_loop(self):
+        """Fetch depth + RGB pairs so USB transfers overlap the rendering"""
+        while self.capture_running:
+            depth = self.get_depth_data()
+            rgb = self.get_rgb_data()
+            if depth is None or rgb is None:
+                time.sleep(0.1)
+                continue
+            with self._frame_cond:
+                self.latest_frames = (depth, rgb)
+                self.frame_seq += 1
+                self._frame_cond.notify_all()
+    
+    def wait_for_frames(self, last_seq, timeout=0.1):
+        """Return (depth, rgb, seq) once a pair newer than last_seq arrives.
+        
+        Returns (None, None, last_seq) if nothing new shows up in time.
+        """
+        with self._frame_cond:
+            if not self._frame_cond.wait_for(lambda: self.frame_seq != last_seq, timeout):
+                return None, None, last_seq
+            depth, rgb = self.latest_frames
+            return depth, rgb, self.frame_seq
+
     def find_person_center(self, depth):
         """Find the center of the largest person-like object"""
         # Create mask for objects within depth range
@@ -398,111 +490,178 @@ Instructions:
         
         return None, None, mask
 
+    def update_depth_span(self):
+        """Cache the depth_min..depth_max span used by normalize_depth.
+        
+        Called whenever a distance slider moves, so the per-frame path
+        doesn't recompute it. Also caches the raw depth cutoff for person
+        detection: normalize_depth(d) > 200 exactly when 0 < d <= cutoff.
+        With depth_max <= depth_min every pixel normalizes to 0, so the
+        cutoff is 0 and nothing is detected.
+        """
+        self._depth_span = max(self.depth_max - self.depth_min, 1)
+        if self.depth_max <= self.depth_min:
+            self._person_depth_cutoff = 0
+        else:
+            self._person_depth_cutoff = self.depth_max - -(-201 * self._depth_span // 255)
+    
     def normalize_depth(self, depth_mm):
         """Normalize depth to 0-255 gradient like kinect_viewer"""
-        d = depth_mm.copy().astype(np.float32)
-        d[d <= 0] = np.nan
-        near, far = float(self.depth_min), float(self.depth_max)
-        d = np.clip(d, near, far)
-        d = (d - near) / (far - near)  # 0..1
-        d = (1.0 - d) * 255.0          # invert so near = bright
-        d[np.isnan(d)] = 0
-        return d.astype(np.uint8)
+        near, far, span = self.depth_min, self.depth_max, self._depth_span
+        
+        # Integer map, inverted so near = bright: (far - d) * 255 // (far - near)
+        d = np.clip(depth_mm, near, far).astype(np.uint32)
+        np.subtract(far, d, out=d)
+        d *= 255
+        d //= span
+        out = d.astype(np.uint8)
+        
+        # No reading stays black
+        np.copyto(out, 0, where=depth_mm == 0)
+        return out
     
     def add_silhouette_to_trail(self, silhouette):
-        """Add a silhouette to the ghost trail"""
-        self.ghost_trails.append(silhouette.copy())
+        """Add a 0/255 silhouette to the ghost trail, overwriting the oldest slot"""
+        length = min(self.ghost_trail_length, self.TRAIL_SLOTS)
+        if (self._trail_bits is None or self._trail_bits.shape != silhouette.shape
+                or self._trail_len != length):
+            # Start a fresh ring; old slot bits and LUTs don't match the new order
+            self._trail_bits = np.zeros(silhouette.shape, dtype=np.uint8)
+            self._trail_len = length
+            self._trail_idx = 0
+            self._trail_count = 0
+            self._trail_luts = None
+        
+        bit = np.uint8(1 << self._trail_idx)
+        np.bitwise_and(self._trail_bits, ~bit, out=self._trail_bits)
+        np.bitwise_or(self._trail_bits, np.bitwise_and(silhouette, bit), out=self._trail_bits)
         
         # Keep only the last N frames
-        if len(self.ghost_trails) > self.ghost_trail_length:
-            self.ghost_trails.pop(0)
+        self._trail_idx = (self._trail_idx + 1) % self._trail_len
+        self._trail_count = min(self._trail_count + 1, self._trail_len)
+        self._trail_weights = None
+    
+    def composite_ghost_trails(self, output):
+        """Blend every trail silhouette over output in a single pass.
+        
+        Stacking the layers oldest to newest leaves each pixel at
+        output * keep + color * (1 - keep), where keep is the product of
+        (1 - opacity) over the layers covering it. keep only depends on the
+        pixel's slot bits, so it comes from a 256-entry table.
+        """
+        n = self._trail_count
+        if n == 0:
+            return output
+        
+        key = (self._trail_idx, n, self.silhouette_alpha)
+        if self._trail_luts is None or self._trail_luts[0] != key:
+            codes = np.arange(256)
+            keep = np.ones(256, dtype=np.float32)
+            for age in range(n):
+                # Newer silhouettes are more opaque
+                slot = (self._trail_idx - n + age) % self._trail_len
+                opacity = self.silhouette_alpha * (age + 1) / n
+                keep[(codes >> slot) & 1 == 1] *= 1 - opacity
+            self._trail_luts = (key, keep.reshape(1, 256), (1 - keep).reshape(1, 256))
+            self._trail_weights = None
+        
+        # Per-pixel weights only change when a silhouette is added, so frames
+        # where nobody is detected reuse them and just redo the blend
+        if self._trail_weights is None:
+            _, keep_lut, alpha_lut = self._trail_luts
+            self._trail_weights = (cv2.LUT(self._trail_bits, keep_lut),
+                                   cv2.LUT(self._trail_bits, alpha_lut))
+        keep_weights, alpha_weights = self._trail_weights
+        
+        if self._color_plate is None or self._color_plate.shape != output.shape:
+            self._color_plate = np.full(output.shape, self.silhouette_color, dtype=np.uint8)
+        
+        return cv2.blendLinear(output, self._color_plate, keep_weights, alpha_weights, dst=output)
     
     
-    def track_people(self, current_blobs):
+    def track_people(self, blobs):
         """Track people across frames and maintain ghost assignments"""
         # Simple tracking based on centroid distance
         # If a person's centroid is close to a previous person, keep the same ID
         
-        if not hasattr(self, 'previous_blobs'):
-            self.previous_blobs = []
+        if not hasattr(self, 'previous_xy'):
+            self.previous_xy = np.empty((0, 2), dtype=np.float32)
+            self.previous_ids = np.empty(0, dtype=np.int32)
             self.person_counter = 0
         
-        # Match current blobs to previous blobs
-        matched = [False] * len(current_blobs)
-        for prev_id, prev_blob in enumerate(self.previous_blobs):
-            px, py = prev_blob['center']
-            min_dist = float('inf')
-            best_match = None
+        # Match current blobs to previous blobs. All pairwise squared distances
+        # come from one broadcast; the greedy pass then just masks out columns
+        # that are already taken.
+        ids = np.zeros(len(blobs), dtype=np.int32)
+        matched = np.zeros(len(blobs), dtype=bool)
+        if len(self.previous_ids) and len(blobs):
+            cur_xy = blobs.xy.astype(np.float32)
+            d2 = ((self.previous_xy[:, None, :] - cur_xy[None, :, :]) ** 2).sum(axis=2)
             
-            for i, blob_data in enumerate(current_blobs):
-                if matched[i]:
-                    continue
-                # Extract coordinates from blob data
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                
-                dist = np.sqrt((cx - px)**2 + (cy - py)**2)
-                if dist < min_dist and dist < 100:  # Threshold for matching
-                    min_dist = dist
-                    best_match = i
-            
-            if best_match is not None:
-                matched[best_match] = True
-                # Reuse the previous person ID
-                blob_data = current_blobs[best_match]
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                current_blobs[best_match] = (cx, cy, blob_depth, contour, prev_blob['id'])
+            for prev_id, dists in zip(self.previous_ids.tolist(), d2):
+                row = np.where(matched, np.inf, dists)
+                best_match = int(row.argmin())
+                if row[best_match] < 100 ** 2:  # Threshold for matching
+                    matched[best_match] = True
+                    # Reuse the previous person ID
+                    ids[best_match] = prev_id
         
         # Assign new IDs to unmatched blobs
-        for i, is_matched in enumerate(matched):
-            if not is_matched:
-                blob_data = current_blobs[i]
-                if len(blob_data) == 5:
-                    cx, cy, blob_depth, contour, _ = blob_data
-                else:
-                    cx, cy, blob_depth, contour = blob_data
-                self.person_counter += 1
-                current_blobs[i] = (cx, cy, blob_depth, contour, self.person_counter)
+        unmatched = np.flatnonzero(~matched)
+        ids[unmatched] = self.person_counter + 1 + np.arange(len(unmatched))
+        self.person_counter += len(unmatched)
+        blobs.ids = ids
         
         # Update previous blobs
-        self.previous_blobs = [{'center': (cx, cy), 'id': pid} for cx, cy, _, _, pid in current_blobs]
+        self.previous_xy = blobs.xy.astype(np.float32)
+        self.previous_ids = ids.copy()
         
-        return current_blobs
+        return blobs
     
     def find_all_person_blobs(self, depth):
-        """Find all person-like blobs in the depth map using gradient"""
-        # Normalize depth to 0-255 gradient (like kinect_viewer)
-        depth_normalized = self.normalize_depth(depth)
+        """Find all person-like blobs in the depth map using gradient.
+        
+        Returns a BlobSet sorted by area (largest first) with tracked ids.
+        """
+        # Work at reduced resolution - person-sized blobs don't need every pixel.
+        # Nearest-neighbour keeps raw depths (averaging would mix in zeros)
+        scale = self.CONTOUR_SCALE
+        depth_small = cv2.resize(depth, None, fx=1 / scale, fy=1 / scale,
+                                 interpolation=cv2.INTER_NEAREST)
         
-        # Threshold to find bright areas (white = person/subject)
-        # Subject is white in the normalized depth (bright = close), so threshold for bright pixels
-        # Don't invert - we want to track the white/bright objects
-        _, mask = cv2.threshold(depth_normalized, 200, 255, cv2.THRESH_BINARY)
+        # Find the areas that would be bright (> 200, white = person/subject)
+        # in the normalized gradient, by thresholding the raw depth directly
+        mask = cv2.inRange(depth_small, 1, self._person_depth_cutoff)
         
         # Find contours on the mask (white areas = people)
         contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        person_blobs = []
+        xy, depths, areas, kept = [], [], [], []
         for contour in contours:
-            area = cv2.contourArea(contour)
+            # Full-frame area - scaling the contour by s scales its area by
+            # exactly s*s, so only contours that pass get scaled back up
+            area = cv2.contourArea(contour) * (scale * scale)
             # Person-like size range - adjust as needed
             if area > 5000:  # Minimum person size
+                # Back to full-frame coordinates, so centers are unchanged
+                contour = contour * scale
                 M = cv2.moments(contour)
                 if M["m00"] > 0:
                     cx = int(M["m10"] / M["m00"])
                     cy = int(M["m01"] / M["m00"])
                     
                     if 0 <= cy < depth.shape[0] and 0 <= cx < depth.shape[1]:
-                        blob_depth = depth[cy, cx]
-                        person_blobs.append((cx, cy, blob_depth, contour))
+                        xy.append((cx, cy))
+                        depths.append(depth[cy, cx])
+                        areas.append(area)
+                        kept.append(contour)
+        
+        person_blobs = BlobSet(np.array(xy, dtype=np.int32).reshape(-1, 2),
+                               np.array(depths, dtype=np.uint16),
+                               np.array(areas, dtype=np.float32), kept)
         
-        # Sort by area (largest first)
-        person_blobs.sort(key=lambda x: cv2.contourArea(x[3]), reverse=True)
+        # Sort by area (largest first), using the areas computed above
+        person_blobs = person_blobs.take(np.argsort(-person_blobs.area, kind='stable'))
         
         # Track people across frames
         person_blobs = self.track_people(person_blobs)
@@ -559,8 +718,14 @@ Instructions:
             # Fixed size for person center
             ghost_size = 120
         
-        # Resize ghost sprite
-        ghost_resized = cv2.resize(self.ghost_sprite, (ghost_size, ghost_size))
+        # Resize ghost sprite; sizes are rounded to 4 px so nearby sizes share
+        # one cached resize (at most ~40 per sprite for the 50-200 px range)
+        ghost_size = max(4, (ghost_size + 2) // 4 * 4)
+        key = (id(self.ghost_sprite), ghost_size)
+        ghost_resized = self._ghost_cache.get(key)
+        if ghost_resized is None:
+            ghost_resized = cv2.resize(self.ghost_sprite, (ghost_size, ghost_size))
+            self._ghost_cache[key] = ghost_resized
         
         # Calculate position to center the ghost
         half_size = ghost_size // 2
@@ -581,11 +746,10 @@ Instructions:
             alpha = np.ones((ghost_resized.shape[0], ghost_resized.shape[1]))
             ghost_rgb = ghost_resized
         
-        # Blend ghost with background
+        # Blend ghost with background in one OpenCV pass over all channels
         roi = image[y1:y2, x1:x2]
-        for c in range(3):
-            roi[:, :, c] = (1 - alpha * self.ghost_alpha) * roi[:, :, c] + \
-                          (alpha * self.ghost_alpha) * ghost_rgb[:, :, c]
+        a = (alpha * self.ghost_alpha).astype(np.float32)
+        roi[:] = cv2.blendLinear(roi, ghost_rgb, 1 - a, a)
         
         return image
 
@@ -617,11 +781,12 @@ Instructions:
         print("Press 'q' to quit, 's' to save a frame")
         print("Looking for Kinect...")
         
+        self.start_capture()
+        seq = 0
         try:
             while True:
-                # Get data from Kinect
-                depth = self.get_depth_data()
-                rgb = self.get_rgb_data()
+                # Get the newest frames from the capture thread
+                depth, rgb, seq = self.wait_for_frames(seq)
                 
                 if depth is None or rgb is None:
                     print("Waiting for Kinect...", end='\r')
@@ -632,8 +797,9 @@ Instructions:
                     cv2.putText(test_output, "Make sure Kinect is plugged in and powered", (50, 280), 
                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
                     cv2.imshow("👻 Video Ghosting Effect - Main View", test_output)
-                    cv2.imshow("🔍 Depth Map & Detection", test_output)
-                    time.sleep(0.1)
+                    if self.debug_mode:
+                        cv2.imshow("🔍 Depth Map & Detection", test_output)
+                    cv2.waitKey(1)
                     continue
                 
                 # Mirror RGB feed for easier interaction
@@ -643,7 +809,8 @@ Instructions:
                 if self.capture_background:
                     # Start time exposure capture (3 seconds)
                     self.time_exposure_start_time = time.time()
-                    self.time_exposure_frames_list = []
+                    self.time_exposure_sum = np.zeros(rgb_mirrored.shape, dtype=np.float32)
+                    self.time_exposure_count = 0
                     print(f"⏱️ Starting 3-second time exposure capture...")
                     self.capture_background = False  # Reset flag, will be handled in time exposure logic
                 
@@ -651,37 +818,43 @@ Instructions:
                 if self.time_exposure_start_time is not None:
                     elapsed_time = time.time() - self.time_exposure_start_time
                     if elapsed_time < self.time_exposure_duration:
-                        # Still capturing - add frame to list
-                        self.time_exposure_frames_list.append(rgb_mirrored.copy())
+                        # Still capturing - add frame to the running sum
+                        cv2.accumulate(rgb_mirrored, self.time_exposure_sum)
+                        self.time_exposure_count += 1
                         remaining_time = self.time_exposure_duration - elapsed_time
-                        print(f"⏱️ Time exposure: {elapsed_time:.1f}s / {self.time_exposure_duration:.1f}s (frames: {len(self.time_exposure_frames_list)})")
+                        print(f"⏱️ Time exposure: {elapsed_time:.1f}s / {self.time_exposure_duration:.1f}s (frames: {self.time_exposure_count})")
                         
                         # Progress will be shown on the final output layer later
                     else:
                         # Time exposure complete - process frames
                         print("⏱️ Processing time exposure frames with noise reduction...")
-                        self.background_image = self.average_frames_with_noise_reduction(self.time_exposure_frames_list)
-                        print(f"✅ 3-second time exposure background captured! ({len(self.time_exposure_frames_list)} frames)")
+                        self.background_image = self.average_frames_with_noise_reduction(self.time_exposure_sum, self.time_exposure_count)
+                        print(f"✅ 3-second time exposure background captured! ({self.time_exposure_count} frames)")
                         print("You can now step in front of the camera.")
                         # Mark as completed
                         self.time_exposure_start_time = None
-                        self.time_exposure_frames_list = []
+                        self.time_exposure_sum = None
+                        self.time_exposure_count = 0
+                
+                if self._output_buf is None or self._output_buf.shape != rgb_mirrored.shape:
+                    self._output_buf = np.empty_like(rgb_mirrored)
+                    self._silhouette_buf = np.empty(rgb_mirrored.shape[:2], dtype=np.uint8)
+                output = self._output_buf
                 
                 # Create output with video opacity
                 if self.background_image is not None:
                     # Use captured background
-                    output = self.background_image.copy()
                     if self.video_opacity > 0:
                         # Blend current frame with background based on opacity
-                        output = cv2.addWeighted(self.background_image, 1 - self.video_opacity,
-                                                rgb_mirrored, self.video_opacity, 0)
+                        cv2.addWeighted(self.background_image, 1 - self.video_opacity,
+                                        rgb_mirrored, self.video_opacity, 0, dst=output)
+                    else:
+                        np.copyto(output, self.background_image)
                 elif self.video_opacity > 0:
-                    # Use live feed as background
-                    output = rgb_mirrored.copy()
-                    output = cv2.addWeighted(output, self.video_opacity,
-                                           np.zeros_like(output), 1 - self.video_opacity, 0)
+                    # Use live feed as background, faded toward black
+                    cv2.convertScaleAbs(rgb_mirrored, output, self.video_opacity)
                 else:
-                    output = np.zeros_like(rgb_mirrored)
+                    output.fill(0)
                 
                 # Mirror depth feed to match RGB
                 depth_mirrored = cv2.flip(depth, 1)
@@ -694,39 +867,33 @@ Instructions:
                 person_blobs = self.find_all_person_blobs(depth_mirrored)
                 
                 if person_blobs and should_process_silhouette:
-                    # Create combined silhouette from all detected people
-                    combined_silhouette = np.zeros_like(depth_mirrored, dtype=np.uint8)
+                    # Create combined silhouette from all detected people in one
+                    # fill (external contours never overlap)
+                    combined_silhouette = self._silhouette_buf
+                    combined_silhouette.fill(0)
+                    cv2.drawContours(combined_silhouette, person_blobs.contours, -1, 255,
+                                     thickness=cv2.FILLED)
                     
-                    for i, blob_data in enumerate(person_blobs):
-                        # Extract blob data
-                        if len(blob_data) == 5:
-                            cx, cy, blob_depth, contour, person_id = blob_data
-                        else:
-                            cx, cy, blob_depth, contour = blob_data
-                            person_id = i + 1
-                        
+                    for blob_depth, contour, person_id in zip(person_blobs.depth.tolist(),
+                                                              person_blobs.contours,
+                                                              person_blobs.ids.tolist()):
                         # Draw bounding box around blob (debug mode only)
                         x, y, w, h = cv2.boundingRect(contour)
                         if self.debug_mode:
                             cv2.rectangle(output, (x, y), (x + w, y + h), (0, 255, 0), 2)
                         
-                        # Create mask for this person
-                        person_mask = np.zeros_like(depth_mirrored, dtype=np.uint8)
-                        cv2.fillPoly(person_mask, [contour], 255)
-                        
-                        # Add to combined silhouette
-                        combined_silhouette = cv2.bitwise_or(combined_silhouette, person_mask)
-                        
                         # Draw person number and distance (debug mode only)
                         if self.debug_mode:
                             distance_feet = blob_depth / 304.8
                             cv2.putText(output, f"Person {person_id}: {distance_feet:.2f}ft", 
                                        (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
                     
-                    # Add current silhouette to trail
-                    if np.any(combined_silhouette):
-                        self.add_silhouette_to_trail(combined_silhouette)
-                        self.last_silhouette = combined_silhouette.copy()
+                    # Add current silhouette to trail (never empty here - every
+                    # blob passed the minimum area check before being filled).
+                    # The trail copies it, and the buffer is only refilled when
+                    # the next silhouette replaces last_silhouette anyway
+                    self.add_silhouette_to_trail(combined_silhouette)
+                    self.last_silhouette = combined_silhouette
                 elif person_blobs and not should_process_silhouette:
                     # Use last silhouette for skipped frames
                     if self.last_silhouette is not None:
@@ -734,22 +901,12 @@ Instructions:
                 
                 # Start with background if available, otherwise use current frame
                 if self.background_image is not None:
-                    output = self.background_image.copy()
+                    np.copyto(output, self.background_image)
                 else:
-                    output = rgb_mirrored.copy()
+                    np.copyto(output, rgb_mirrored)
                 
-                # Draw all silhouettes in the trail with decreasing opacity (optimized)
-                for i, trail_silhouette in enumerate(self.ghost_trails):
-                    if np.any(trail_silhouette):
-                        # Calculate opacity (newer silhouettes are more opaque)
-                        opacity = self.silhouette_alpha * (i + 1) / len(self.ghost_trails)
-                        
-                        # Create mask for silhouette (white areas only)
-                        mask = trail_silhouette > 0
-                        
-                        # Apply silhouette with transparency using vectorized operations
-                        silhouette_color_array = np.array(self.silhouette_color, dtype=np.uint8)
-                        output[mask] = (1 - opacity) * output[mask] + opacity * silhouette_color_array
+                # Draw all silhouettes in the trail with decreasing opacity
+                self.composite_ghost_trails(output)
                 
                 # Display status (debug mode only)
                 if self.debug_mode:
@@ -776,18 +933,14 @@ Instructions:
                 # Display output
                 cv2.imshow("👻 Video Ghosting Effect - Main View", output)
                 
-                # Show debug depth mask with gradient
-                debug_mask = self.normalize_depth(depth_mirrored)
-                if person_blobs:
-                    # Draw detected contours on gradient
-                    for blob_data in person_blobs:
-                        # Extract contour from blob data
-                        if len(blob_data) == 5:
-                            _, _, _, contour, _ = blob_data
-                        else:
-                            _, _, _, contour = blob_data
-                        cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
-                cv2.imshow("🔍 Depth Map & Detection", debug_mask)
+                # Show debug depth mask with gradient (debug mode only)
+                if self.debug_mode:
+                    debug_mask = self.normalize_depth(depth_mirrored)
+                    if person_blobs:
+                        # Draw detected contours on gradient
+                        for contour in person_blobs.contours:
+                            cv2.drawContours(debug_mask, [contour], -1, 0, 2)  # Draw in black for visibility
+                    cv2.imshow("🔍 Depth Map & Detection", debug_mask)
                 
                 # Handle key presses
                 key = cv2.waitKey(1) & 0xFF
@@ -806,6 +959,7 @@ Instructions:
             traceback.print_exc()
         finally:
             print("🧹 Cleaning up...")
+            self.stop_capture()
             cv2.destroyAllWindows()
             # Safe cleanup of freenect
             try: